@@ -0,0 +1,41 @@
+"""Time emoji searches from a cold, warm and persisted index.
+
+Run with: python bench_emoji.py
+"""
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import emoji
+
+TERMS = ['sun', 'cat', 'heart', 'face', 'moon', 'dog', 'smiling', 'hand']
+
+
+def timed(label, func):
+    start = perf_counter()
+    func()
+    print(f'{label:<45} {perf_counter() - start:8.4f}s')
+
+
+def scan(term):
+    """The original search, rebuilding the mapping on every call."""
+    term = term.upper()
+    return {key: value for key, value in emoji._make_emoji_mapping().items()
+            if term in value}
+
+
+def main():
+    timed('full scan, 1 term', lambda: scan(TERMS[0]))
+    with TemporaryDirectory() as cache_dir:
+        timed('cold: build index + save, 1 term',
+              lambda: emoji.get_index(cache_dir).search(TERMS[0]))
+        timed(f'warm: {len(TERMS)} terms',
+              lambda: emoji.find_emojis(TERMS))
+        emoji._index = None
+        timed('persisted: load index, 1 term',
+              lambda: emoji.get_index(cache_dir).search(TERMS[0]))
+        timed(f'warm: {len(TERMS)} terms',
+              lambda: emoji.find_emojis(TERMS))
+
+
+if __name__ == '__main__':
+    main()
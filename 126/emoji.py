@@ -1,8 +1,14 @@
+import pickle
 import sys
 import unicodedata
+from array import array
+from pathlib import Path
 
 
 START_EMOJI_RANGE = 127744
+NGRAM = 3
+
+_index = None
 
 
 def what_means_emoji(emoji):
@@ -16,11 +22,139 @@ def _make_emoji_mapping():
     return {chr(i): what_means_emoji(chr(i)) for i in range(START_EMOJI_RANGE, sys.maxunicode + 1)}
 
 
+class EmojiIndex:
+    """Searchable names of all named code points from START_EMOJI_RANGE.
+
+    Holds an inverted word index (word -> ids) and an n-gram index
+    (every NGRAM long substring -> sorted array of ids) so a search only
+    verifies the few names that can possibly match instead of scanning
+    them all. Both are built on first use; save/load keep the names and
+    n-grams so a cold start can skip the Unicode database scan.
+    """
+
+    def __init__(self, codepoints, names, ngrams=None):
+        self.codepoints = codepoints
+        self.names = names
+        self._words = None
+        self._ngrams = ngrams
+
+    @classmethod
+    def build(cls):
+        codepoints, names = array('l'), []
+        for i in range(START_EMOJI_RANGE, sys.maxunicode + 1):
+            name = unicodedata.name(chr(i), None)
+            if name is not None:
+                codepoints.append(i)
+                names.append(name)
+        return cls(codepoints, names)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index, None if missing or for another Unicode version."""
+        try:
+            with open(path, 'rb') as f:
+                version, codepoints, names, ngrams = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+        if version != unicodedata.unidata_version:
+            return None
+        ngrams = {gram: array('l', ids) for gram, ids in ngrams.items()}
+        return cls(array('l', codepoints), names.split('\n'), ngrams)
+
+    def save(self, path):
+        """Save names and n-grams as flat strings and bytes for fast loading."""
+        ngrams = {gram: ids.tobytes() for gram, ids in self.ngrams.items()}
+        with open(path, 'wb') as f:
+            pickle.dump((unicodedata.unidata_version,
+                         self.codepoints.tobytes(), '\n'.join(self.names),
+                         ngrams),
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @property
+    def words(self):
+        if self._words is None:
+            words = {}
+            for idx, name in enumerate(self.names):
+                for word in set(name.split()):
+                    words.setdefault(word, []).append(idx)
+            self._words = words
+        return self._words
+
+    @property
+    def ngrams(self):
+        if self._ngrams is None:
+            ngrams = {}
+            for idx, name in enumerate(self.names):
+                grams = {name[start:start + NGRAM]
+                         for start in range(len(name) - NGRAM + 1)}
+                for gram in grams:
+                    ngrams.setdefault(gram, array('l')).append(idx)
+            self._ngrams = ngrams
+        return self._ngrams
+
+    def _candidates(self, term, whole_words):
+        if whole_words:
+            postings = [self.words.get(word, ()) for word in term.split()]
+        elif len(term) >= NGRAM:
+            postings = [self.ngrams.get(term[start:start + NGRAM], ())
+                        for start in range(len(term) - NGRAM + 1)]
+        else:
+            return range(len(self.names))
+        if not postings:
+            return ()
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        return sorted(candidates)
+
+    def search(self, term, whole_words=False):
+        """Return {emoji: name} for names containing term (case insensitive).
+
+        With whole_words every word of term has to be a word of the name.
+        """
+        term = term.upper()
+        matches = {}
+        for idx in self._candidates(term, whole_words):
+            name = self.names[idx]
+            if whole_words or term in name:
+                matches[chr(self.codepoints[idx])] = name
+        return matches
+
+
+def _cache_path(cache_dir):
+    return Path(cache_dir) / f'emoji_index_{unicodedata.unidata_version}.pickle'
+
+
+def get_index(cache_dir=None):
+    """Return the module wide EmojiIndex, building it on first use.
+
+    With cache_dir the index is loaded from (or saved to) a file there
+    that is keyed by the Unicode database version.
+    """
+    global _index
+    if _index is None:
+        index = None
+        if cache_dir is not None:
+            index = EmojiIndex.load(_cache_path(cache_dir))
+        if index is None:
+            index = EmojiIndex.build()
+            if cache_dir is not None:
+                index.save(_cache_path(cache_dir))
+        _index = index
+    return _index
+
+
 def find_emoji(term):
     """Return emojis and their texts that match (case insensitive)
        term, print matches to console"""
-    term = term.upper()
-    emoji_mapping = _make_emoji_mapping()
-    matching_emojis = {key: value for key, value in emoji_mapping.items() if term in value}
+    matching_emojis = get_index().search(term)
     for emoji, name in matching_emojis.items():
         print(f'{name:<50} | {emoji}')
+    return matching_emojis
+
+
+def find_emojis(terms):
+    """Return {term: {emoji: name}} for a batch of terms, without printing"""
+    index = get_index()
+    return {term: index.search(term) for term in terms}
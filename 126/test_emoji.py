@@ -1,4 +1,5 @@
-from emoji import what_means_emoji, find_emoji
+from emoji import (EmojiIndex, _make_emoji_mapping, find_emoji, find_emojis,
+                   get_index, what_means_emoji)
 
 
 def test_what_means_emoji_found():
@@ -26,4 +27,33 @@ def test_find_matches(capfd):
 def test_find_no_match(capfd):
     find_emoji('awesome')
     output = capfd.readouterr()[0].lower()
-    assert not output.strip() or 'no matches' in output.lower()
\ No newline at end of file
+    assert not output.strip() or 'no matches' in output.lower()
+
+
+def test_find_matches_same_as_scan():
+    mapping = _make_emoji_mapping()
+    for term in ('sun', 'cat face', 'ox', 'e', 'heart'):
+        expected = {key: value for key, value in mapping.items()
+                    if term.upper() in value}
+        assert find_emojis([term])[term] == expected
+
+
+def test_find_emojis():
+    matches = find_emojis(['sunrise', 'awesome'])
+    assert matches['sunrise']['🌅'] == 'SUNRISE'
+    assert matches['awesome'] == {}
+
+
+def test_search_whole_words():
+    matches = get_index().search('sun face', whole_words=True)
+    assert matches == {'🌞': 'SUN WITH FACE'}
+
+
+def test_index_persisted(tmp_path):
+    index = get_index()
+    index.save(tmp_path / 'index.pickle')
+    loaded = EmojiIndex.load(tmp_path / 'index.pickle')
+    assert loaded.names == index.names
+    assert loaded.codepoints == index.codepoints
+    assert loaded.search('sunset') == index.search('sunset')
+    assert EmojiIndex.load(tmp_path / 'missing.pickle') is None
@@ -0,0 +1,53 @@
+"""Scaling benchmark for the two_sums engines.
+
+Run with: python bench_twosums.py [max exponent, default 7]
+"""
+import sys
+from itertools import combinations
+from random import sample, seed
+from time import perf_counter
+
+import numpy as np
+
+from twosums import two_sums, two_sums_many, two_sums_numpy
+
+
+def combinations_two_sums(numbers, target):
+    """The original O(n^2) implementation, kept for comparison."""
+    possible_matches = [
+        pair for pair in combinations(enumerate(numbers), 2)
+        if pair[0][1]+pair[1][1] == target and pair[0][0] < pair[1][0]
+    ]
+    if len(possible_matches) == 0:
+        return None
+    match = min(possible_matches, key=lambda x: x[0][1])
+    return (match[0][0], match[1][0])
+
+
+def timed(func, *args):
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+def main(max_exponent=7):
+    seed(134)
+    print(f"{'n':>12} {'combinations':>13} {'hash':>8} {'numpy':>8}"
+          f" {'np array':>9} {'many (1000)':>12}")
+    for exponent in range(3, max_exponent + 1):
+        size = 10 ** exponent
+        numbers = sample(range(size * 10), size)
+        target = numbers[size // 3] + numbers[-1]
+        combos = (f'{timed(combinations_two_sums, numbers, target):.3f}'
+                  if exponent <= 3 else '-')
+        targets = [target + offset for offset in range(1000)]
+        array = np.array(numbers)
+        print(f'{size:>12,} {combos:>13}'
+              f' {timed(two_sums, numbers, target):>8.3f}'
+              f' {timed(two_sums_numpy, numbers, target):>8.3f}'
+              f' {timed(two_sums_numpy, array, target):>9.3f}'
+              f' {timed(two_sums_many, numbers, targets):>12.3f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
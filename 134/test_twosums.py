@@ -1,7 +1,8 @@
 import pytest
 from random import sample, seed
 
-from twosums import two_sums
+import twosums
+from twosums import two_sums, two_sums_many, two_sums_numpy
 
 NUMBERS = [
     2202, 9326, 1034, 4180, 1932, 8118, 7365, 7738, 6220, 3440, 1538, 7994, 465, 
@@ -47,4 +48,56 @@ def test_two_sums_random():
 
 def test_two_sums_none():
     result = two_sums(NUMBERS, 7000)
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+
+def test_two_sums_streamed():
+    numbers = [3, 10, 14, 8, 15, 5, 16, 13, 9, 2]
+    assert two_sums(iter(numbers), 30) == (2, 6)
+
+
+def test_two_sums_duplicates():
+    assert two_sums([5, 1, 5, 9, 1], 10) == (1, 3)
+    assert two_sums([5, 7, 5], 10) == (0, 2)
+    assert two_sums([5, 7], 10) is None
+
+
+def test_two_sums_many():
+    targets = [10093, 7067, 11261, 11350, 5224, 2934785974, 7000]
+    expected = [two_sums(NUMBERS, target) for target in targets]
+    assert two_sums_many(NUMBERS, targets) == expected
+
+
+def test_two_sums_many_random():
+    seed(2)
+    numbers = sample(range(-500, 500), 300) * 2
+    targets = range(-1000, 1000, 13)
+    expected = [two_sums(numbers, target) for target in targets]
+    assert two_sums_many(numbers, targets) == expected
+
+
+def test_two_sums_numpy():
+    pytest.importorskip('numpy')
+    seed(3)
+    numbers = sample(range(-500, 500), 300) * 2
+    for target in list(range(-1000, 1000, 13)) + [10_000]:
+        assert two_sums_numpy(numbers, target) == two_sums(numbers, target)
+    assert two_sums_numpy(NUMBERS, 11350) == (37, 41)
+    assert two_sums_numpy([1], 2) is None
+
+
+def test_two_sums_numpy_vectorized(monkeypatch):
+    np = pytest.importorskip('numpy')
+    monkeypatch.setattr(twosums, 'NUMPY_MIN_SIZE', 0)
+    seed(4)
+    numbers = sample(range(-500, 500), 300) * 2
+    for target in list(range(-1000, 1000, 13)) + [10_000]:
+        expected = two_sums(numbers, target)
+        assert two_sums_numpy(numbers, target) == expected
+        assert two_sums_numpy(np.array(numbers), target) == expected
+    assert two_sums_numpy([1], 2) is None
+    assert two_sums_numpy([], 2) is None
+
+
+def test_two_sums_many_empty():
+    assert two_sums_many([], [1, 2]) == [None, None]
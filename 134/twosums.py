@@ -1,18 +1,110 @@
-from itertools import combinations
+from bisect import bisect_left, bisect_right
+
+# below this many numbers two_sums_numpy hands over to two_sums
+NUMPY_MIN_SIZE = 50_000
+
 
 def two_sums(numbers, target):
     """Finds the indexes of the two numbers that add up to target.
 
+    Single pass over numbers (any iterable, so it can be streamed) with a
+    hash of already seen values; ties are broken by the smallest first value.
+
     :param numbers: list - random unique numbers
     :param target: int - sum of two values from numbers list
     :return: tuple - (index1, index2) or None
     """
-    possible_matches = [
-        pair for pair in combinations(enumerate(numbers), 2)
-        if pair[0][1]+pair[1][1] == target and pair[0][0] < pair[1][0]
-    ]
-    if len(possible_matches) == 0:
+    seen = {}
+    best = None
+    for idx, number in enumerate(numbers):
+        complement = target - number
+        if complement in seen and (best is None or complement < best[0]):
+            best = (complement, seen[complement], idx)
+        seen.setdefault(number, idx)
+    if best is None:
+        return None
+    return best[1:]
+
+
+def _build_index(numbers):
+    """Map every distinct value to its first position, and values that
+    occur more than once to the sorted list of all their positions."""
+    positions, repeated = {}, {}
+    for idx, number in enumerate(numbers):
+        first = positions.setdefault(number, idx)
+        if first != idx:
+            repeated.setdefault(number, [first]).append(idx)
+    return sorted(positions), positions, repeated
+
+
+def _two_sums_indexed(values, positions, repeated, target):
+    # values are ascending, so the first valid pair has the smallest first
+    # value; values below target - max have no complement, skip them
+    for idx in range(bisect_left(values, target - values[-1]), len(values)):
+        value = values[idx]
+        complement = target - value
+        complement_first = positions.get(complement)
+        if complement_first is None:
+            continue
+        first = positions[value]
+        complement_positions = repeated.get(complement)
+        if complement_positions is None:
+            if complement_first > first:
+                return (first, complement_first)
+        elif complement_positions[-1] > first:
+            later = bisect_right(complement_positions, first)
+            return (first, complement_positions[later])
+    return None
+
+
+def two_sums_many(numbers, targets):
+    """Resolve many targets against one index of numbers.
+
+    :param numbers: list - random unique numbers
+    :param targets: iterable of ints
+    :return: list - a two_sums result (tuple or None) per target
+    """
+    values, positions, repeated = _build_index(numbers)
+    if not values:
+        return [None for _ in targets]
+    return [_two_sums_indexed(values, positions, repeated, target)
+            for target in targets]
+
+
+def two_sums_numpy(numbers, target):
+    """Sort-based two_sums for very large numeric arrays.
+
+    Needs numpy; one argsort gives the distinct values with their first
+    and last positions, then the complement of every distinct value is
+    found with one vectorized searchsorted instead of a Python level
+    loop. Inputs smaller than NUMPY_MIN_SIZE go to two_sums, which is
+    faster there.
+    """
+    import numpy as np
+
+    if len(numbers) < NUMPY_MIN_SIZE:
+        if isinstance(numbers, np.ndarray):
+            numbers = numbers.tolist()
+        return two_sums(numbers, target)
+    numbers = np.asarray(numbers)
+    if numbers.size < 2:
+        return None
+    order = np.argsort(numbers)
+    ordered = numbers[order]
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    values = ordered[starts]
+    first = np.minimum.reduceat(order, starts)
+    last = np.maximum.reduceat(order, starts)
+
+    complements = target - values
+    found = np.searchsorted(values, complements)
+    found[found == values.size] = 0
+    valid = (values[found] == complements) & (first < last[found])
+    if not valid.any():
         return None
 
-    match = min(possible_matches, key=lambda x: x[0][1])
-    return (match[0][0], match[1][0])
+    smallest = int(np.argmax(valid))
+    index1 = int(first[smallest])
+    complement_positions = np.flatnonzero(numbers == complements[smallest])
+    later = np.searchsorted(complement_positions, index1, side='right')
+    return (index1, int(complement_positions[later]))
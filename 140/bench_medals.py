@@ -0,0 +1,57 @@
+"""Cold versus warm athletes_most_medals on a 10x replicated summer.csv.
+
+Run with: python bench_medals.py [csv path or url, default the Bite's summer.csv]
+"""
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import pandas as pd
+
+from medals import athletes_most_medals, data
+
+REPLICAS = 10
+
+
+def apply_most_medals(csv):
+    """The original read_csv plus groupby.apply implementation."""
+    medals_df = (
+        pd.read_csv(csv)
+        .groupby(['Gender', 'Athlete'])
+        .size()
+        .reset_index(name='Medals')
+    )
+    return (
+        medals_df
+        .groupby(['Gender'])
+        .apply(lambda row: row.nlargest(1, "Medals"))
+        .reset_index(drop=True)
+        [["Athlete", "Medals"]]
+        .set_index('Athlete')
+        .to_dict('dict')['Medals']
+    )
+
+
+def timed(label, func, *args):
+    start = perf_counter()
+    result = func(*args)
+    print(f'{label:<32} {perf_counter() - start:>8.3f}s')
+    return result
+
+
+def main(source=data):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(tmp) / 'summer_x10.csv'
+        df = pd.read_csv(source)
+        pd.concat([df] * REPLICAS).to_csv(csv, index=False)
+        print(f'{len(df) * REPLICAS:,} rows')
+        expected = timed('read_csv + groupby.apply', apply_most_medals, csv)
+        cache_dir = Path(tmp) / 'cache'
+        cold = timed('cold (csv -> parquet)', athletes_most_medals, csv, cache_dir)
+        warm = timed('warm (parquet)', athletes_most_medals, csv, cache_dir)
+        assert cold == warm == expected
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -1,24 +1,73 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
 import pandas as pd
 
 data = "https://bites-data.s3.us-east-2.amazonaws.com/summer.csv"
 
+TMP = Path(os.getenv("TMP", "/tmp"))
+CACHE_DIR = TMP / "medals"
+COLUMNS = ['Gender', 'Athlete']
+TIMEOUT = 10
+
+
+def _source_version(data, cached=None):
+    """ETag/Last-Modified of a remote csv or mtime and size of a local one,
+       cached if it cannot be checked (e.g. offline or timed out)"""
+    try:
+        if urlparse(str(data)).scheme in ('http', 'https'):
+            with urlopen(Request(data, method='HEAD'),
+                         timeout=TIMEOUT) as response:
+                return [response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'),
+                        response.headers.get('Content-Length')]
+        stat = os.stat(data)
+        return [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return cached
+
+
+def load_medals(data=data, cache_dir=CACHE_DIR):
+    """Return the Gender and Athlete columns of data as categoricals.
 
-def athletes_most_medals(data=data):
-    medals_df = (
-        pd.read_csv(data)
-        .groupby(['Gender', 'Athlete'])
+    They are cached as Parquet in cache_dir and only read from the csv
+    again when the source has changed. Pass cache_dir=None to always
+    read the csv.
+    """
+    if cache_dir is None:
+        return pd.read_csv(data, usecols=COLUMNS, dtype='category')
+    cache_dir = Path(cache_dir)
+    name = hashlib.sha1(str(data).encode()).hexdigest()
+    parquet, version_file = cache_dir / f'{name}.parquet', cache_dir / f'{name}.json'
+    cached_version = None
+    if parquet.exists() and version_file.exists():
+        cached_version = json.loads(version_file.read_text())
+    version = _source_version(data, cached_version)
+    if cached_version is not None and version == cached_version:
+        return pd.read_parquet(parquet)
+
+    df = pd.read_csv(data, usecols=COLUMNS, dtype='category')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(parquet, index=False)
+    version_file.write_text(json.dumps(version))
+    return df
+
+
+def athletes_most_medals(data=data, cache_dir=CACHE_DIR):
+    medals = (
+        load_medals(data, cache_dir)
+        .groupby(COLUMNS, observed=True)
         .size()
-        .reset_index(name='Medals')
-    )
-    most_medals_df = (
-        medals_df
-        .groupby(['Gender'])
-        .apply(lambda row: row.nlargest(1, "Medals"))
-        .reset_index(drop=True)
-        [["Athlete", "Medals"]]
-        .set_index('Athlete')
     )
-    return most_medals_df.to_dict('dict')['Medals']
+    # idxmax keeps the first athlete (alphabetically) on ties,
+    # like nlargest(1) on each group did
+    most_medals = medals.loc[medals.groupby(level='Gender').idxmax()]
+    return {athlete: int(count)
+            for (_, athlete), count in most_medals.items()}
 
 if __name__ == "__main__":
     athletes_most_medals()
\ No newline at end of file
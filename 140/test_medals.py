@@ -1,4 +1,10 @@
-from medals import data, athletes_most_medals
+import os
+
+import pandas as pd
+import pytest
+
+import medals
+from medals import data, athletes_most_medals, load_medals
 
 
 def test_athletes_most_medals_default_csv():
@@ -14,4 +20,61 @@ def test_smaller_csv_and_guarantee_checking_male_and_female():
     )
     assert len(ret) == 2
     assert ret["PHELPS, Michael"] == 14
-    assert ret["COUGHLIN, Natalie"] == 7  # not LOCHTE, Ryan
\ No newline at end of file
+    assert ret["COUGHLIN, Natalie"] == 7  # not LOCHTE, Ryan
+
+
+@pytest.fixture
+def summer_csv(tmp_path):
+    csv = tmp_path / "summer.csv"
+    csv.write_text(
+        "Year,Athlete,Gender,Medal\n"
+        "2008,\"PHELPS, Michael\",Men,Gold\n"
+        "2008,\"LOCHTE, Ryan\",Men,Gold\n"
+        "2012,\"LOCHTE, Ryan\",Men,Silver\n"
+        "2012,\"ADAMS, Bob\",Men,Gold\n"
+        "2012,\"ADAMS, Bob\",Men,Bronze\n"
+        "2008,\"COUGHLIN, Natalie\",Women,Gold\n"
+    )
+    return csv
+
+
+def test_local_csv_and_ties(summer_csv, tmp_path):
+    ret = athletes_most_medals(str(summer_csv), tmp_path / "cache")
+    assert ret == {"ADAMS, Bob": 2, "COUGHLIN, Natalie": 1}
+    assert athletes_most_medals(str(summer_csv), None) == ret
+
+
+def test_parquet_cache(summer_csv, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    df = load_medals(str(summer_csv), cache_dir)
+    assert sorted(df.columns) == ["Athlete", "Gender"]
+    assert all(dtype.name == "category" for dtype in df.dtypes)
+    assert len(list(cache_dir.glob("*.parquet"))) == 1
+
+    def read_csv(*args, **kwargs):
+        raise AssertionError("csv read again")
+
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_csv", read_csv)
+        cached = load_medals(str(summer_csv), cache_dir)
+    pd.testing.assert_frame_equal(cached, df)
+
+    with open(summer_csv, "a") as f:
+        f.write("2012,\"COUGHLIN, Natalie\",Women,Silver\n"
+                "2012,\"COUGHLIN, Natalie\",Women,Silver\n")
+    os.utime(summer_csv, ns=(0, 0))
+    assert athletes_most_medals(str(summer_csv), cache_dir) == {
+        "ADAMS, Bob": 2, "COUGHLIN, Natalie": 3}
+
+
+def test_source_version_falls_back_when_offline(monkeypatch):
+    timeouts = []
+
+    def urlopen(request, timeout=None):
+        timeouts.append(timeout)
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(medals, "urlopen", urlopen)
+    assert medals._source_version(data, ["etag"]) == ["etag"]
+    assert medals._source_version(data) is None
+    assert timeouts == [medals.TIMEOUT] * 2
@@ -6,41 +6,199 @@ import pandas as pd
 
 DATA_FILE = "https://bites-data.s3.us-east-2.amazonaws.com/weather-ann-arbor.csv"
 STATION = namedtuple("Station", "ID Date Value")
+KEYS = ['ID', 'MonthDay']
+# (month - 1) * 31 + day - 1, so every day of the year has its own slot
+DAY_SLOTS = 12 * 31
+EVENT_COLUMNS = ['Date', 'ID', 'Record', 'Value', 'Previous']
 
 
-def high_low_record_breakers_for_2015():
-    def _date_to_md(value):
-        d = date.fromisoformat(value)
-        return f'{d.month:02}-{d.day:02}'
-
-    def _date_to_year(value):
-        return int(value.split('-')[0])
-    
-    df = pd.read_csv(DATA_FILE)
-    df['date_str'] = df['Date'].apply(_date_to_md)
-    df['year'] = df['Date'].apply(_date_to_year)
-    
-    minmax = df[df.year < 2015].groupby(['ID', 'date_str']).agg({'Data_Value': [np.min, np.max]})
-    temperatures_2015 = df[df.year == 2015].groupby(['ID', 'date_str']).agg({'Data_Value': [np.min, np.max]})
-
-    record_min = None
-    record_max = None
-    for idx, df in temperatures_2015.groupby(level=[0, 1]):
-        min_temp_2015, max_temp_2015 = df.loc[idx]['Data_Value']
-        min_temp, max_temp = minmax.loc[idx]['Data_Value']
-        if min_temp_2015 < min_temp:
-            if record_min is None or min_temp_2015 < record_min.Value * 10:
-                record_min = STATION(
-                    ID=idx[0], 
-                    Date=date.fromisoformat(f'2015-{idx[1]}'), 
-                    Value=min_temp_2015 / 10
-                )
-        if max_temp_2015 > max_temp:
-            if record_max is None or max_temp_2015 > record_max.Value * 10:
-                record_max = STATION(
-                    ID=idx[0], 
-                    Date=date.fromisoformat(f'2015-{idx[1]}'),
-                    Value=max_temp_2015 / 10
-                )
+def load_observations(data=DATA_FILE, stations=None, chunksize=None):
+    """
+    Read ID, Date and Data_Value of the GHCN daily csv data, parsing
+    the dates once. With stations only their rows are kept, with
+    chunksize an iterator of DataFrames is returned instead.
+    """
+    chunks = pd.read_csv(data, usecols=['ID', 'Date', 'Data_Value'],
+                         parse_dates=['Date'], chunksize=chunksize)
+    if stations is None:
+        return chunks
+    stations = set(stations)
+    if chunksize is None:
+        return chunks[chunks['ID'].isin(stations)]
+    return (chunk[chunk['ID'].isin(stations)] for chunk in chunks)
+
+
+def _min_max(df, year):
+    """
+    Minimum and maximum Data_Value per (ID, MonthDay) of the years
+    before year and of year itself
+    """
+    dates = df['Date'].dt
+    frame = pd.DataFrame({'ID': df['ID'],
+                          'MonthDay': dates.month * 100 + dates.day,
+                          'Year': dates.year,
+                          'Value': df['Data_Value']})
+    history = frame[frame['Year'] < year].groupby(KEYS)['Value'].agg(['min', 'max'])
+    current = frame[frame['Year'] == year].groupby(KEYS)['Value'].agg(['min', 'max'])
+    return history, current
+
+
+def _combine(aggregates):
+    return (pd.concat(aggregates)
+            .groupby(level=[0, 1])
+            .agg({'min': 'min', 'max': 'max'}))
+
+
+def _station(values, idx, year):
+    station_id, month_day = idx
+    return STATION(ID=station_id,
+                   Date=date(year, month_day // 100, month_day % 100),
+                   Value=int(values[idx]) / 10)
 
+
+def record_breakers(year, data=DATA_FILE, stations=None, chunksize=None):
+    """
+    Return the (record high, record low) STATION of year: the largest
+    maximum above and the lowest minimum below all earlier years for
+    the same station and day of the year, None if nothing was broken.
+
+    data is a DataFrame with ID, Date (datetime) and Data_Value columns
+    or a csv to read with load_observations. With chunksize the csv is
+    aggregated chunk by chunk, so only the per (station, day) minima and
+    maxima are held in memory, no matter how large the archive is.
+    """
+    if isinstance(data, pd.DataFrame):
+        if stations is not None:
+            data = data[data['ID'].isin(set(stations))]
+        history, current = _min_max(data, year)
+    elif chunksize is None:
+        history, current = _min_max(load_observations(data, stations), year)
+    else:
+        aggregates = [_min_max(chunk, year)
+                      for chunk in load_observations(data, stations, chunksize)]
+        history = _combine([history for history, _ in aggregates])
+        current = _combine([current for _, current in aggregates])
+
+    joined = current.join(history, how='inner', rsuffix='_history')
+    lows = joined.loc[joined['min'] < joined['min_history'], 'min']
+    highs = joined.loc[joined['max'] > joined['max_history'], 'max']
+    record_max = _station(highs, highs.idxmax(), year) if len(highs) else None
+    record_min = _station(lows, lows.idxmin(), year) if len(lows) else None
     return record_max, record_min
+
+
+def high_low_record_breakers_for_2015():
+    return record_breakers(2015)
+
+
+class RecordTracker:
+    """
+    Running per (station, day of the year) minimum and maximum, kept in
+    two stations x DAY_SLOTS arrays.
+
+    update sweeps through new observations in date order and returns
+    every record breaking event: a day whose lowest (highest) value is
+    below (above) that of all earlier years for the same station and
+    day, which needs at least one earlier year. Updates have to be
+    newer than everything seen before, so a new day of observations can
+    be appended without reprocessing the history.
+    """
+
+    def __init__(self):
+        self.stations = {}
+        self.lows = np.full((0, DAY_SLOTS), np.inf)
+        self.highs = np.full((0, DAY_SLOTS), -np.inf)
+        self.last_date = None
+
+    def _rows(self, ids):
+        codes, uniques = pd.factorize(ids)
+        rows = np.array([self.stations.setdefault(station, len(self.stations))
+                         for station in uniques], dtype=np.intp)
+        missing = len(self.stations) - len(self.lows)
+        if missing:
+            self.lows = np.vstack([self.lows, np.full((missing, DAY_SLOTS), np.inf)])
+            self.highs = np.vstack([self.highs, np.full((missing, DAY_SLOTS), -np.inf)])
+        return rows[codes]
+
+    @staticmethod
+    def _sweep(keys, values, running, kind):
+        """
+        Record flags and previous extremes for values in date order,
+        then fold values into running (a flat view of lows or highs)
+        """
+        cumulative, combine, breaks = (
+            ('cummin', np.fmin, np.less) if kind == 'low'
+            else ('cummax', np.fmax, np.greater))
+        order = np.argsort(keys, kind='stable')
+        by_key = pd.Series(values[order]).groupby(keys[order])
+        earlier = getattr(by_key, cumulative)().groupby(keys[order]).shift()
+        previous = np.empty_like(values)
+        previous[order] = combine(running[keys[order]], earlier.to_numpy())
+        combine.at(running, keys, values)
+        return np.isfinite(previous) & breaks(values, previous), previous
+
+    def update(self, observations):
+        """
+        Add observations (ID, Date, Data_Value columns) that are all
+        newer than the previous update, returns their record breaking
+        events as a DataFrame of EVENT_COLUMNS sorted by date
+        """
+        if observations.empty:
+            return pd.DataFrame(columns=EVENT_COLUMNS)
+        daily = (observations
+                 .groupby(['Date', 'ID'])['Data_Value']
+                 .agg(['min', 'max'])
+                 .reset_index())
+        if self.last_date is not None and daily['Date'].iloc[0] <= self.last_date:
+            raise ValueError(f'observations must be newer than {self.last_date:%Y-%m-%d}')
+        dates = daily['Date'].dt
+        slots = ((dates.month - 1) * 31 + dates.day - 1).to_numpy()
+        keys = self._rows(daily['ID']) * DAY_SLOTS + slots
+
+        events = []
+        for kind, column, running in (('high', 'max', self.highs), ('low', 'min', self.lows)):
+            values = daily[column].to_numpy(dtype=float)
+            record, previous = self._sweep(keys, values, running.reshape(-1), kind)
+            events.append(pd.DataFrame({'Date': daily['Date'][record],
+                                        'ID': daily['ID'][record],
+                                        'Record': kind,
+                                        'Value': values[record] / 10,
+                                        'Previous': previous[record] / 10}))
+        self.last_date = daily['Date'].iloc[-1]
+        return (pd.concat(events)
+                .sort_values(['Date', 'ID'], kind='mergesort')
+                .reset_index(drop=True)[EVENT_COLUMNS])
+
+
+def all_record_breakers(data=DATA_FILE, stations=None):
+    """
+    Every record breaking event of data (a DataFrame or csv as for
+    record_breakers) in one pass, returns (RecordTracker, events)
+    """
+    if not isinstance(data, pd.DataFrame):
+        data = load_observations(data, stations)
+    elif stations is not None:
+        data = data[data['ID'].isin(set(stations))]
+    tracker = RecordTracker()
+    return tracker, tracker.update(data)
+
+
+def yearly_record_breakers(events):
+    """
+    {year: (record high, record low)} from the events of RecordTracker,
+    the same STATION tuples record_breakers returns for each year
+    """
+    dates = events['Date'].dt
+    events = events.assign(Year=dates.year, MonthDay=dates.month * 100 + dates.day)
+    records = {}
+    for year, group in events.sort_values(['Year', 'ID', 'MonthDay']).groupby('Year'):
+        found = []
+        for kind, pick in (('high', 'idxmax'), ('low', 'idxmin')):
+            values = group.loc[group['Record'] == kind, 'Value']
+            if len(values):
+                row = group.loc[getattr(values, pick)()]
+                found.append(STATION(ID=row['ID'], Date=row['Date'].date(), Value=row['Value']))
+            else:
+                found.append(None)
+        records[year] = tuple(found)
+    return records
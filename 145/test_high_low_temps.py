@@ -1,8 +1,10 @@
 import datetime
 
+import pandas as pd
 import pytest
 
-from high_low_temps import STATION
+from high_low_temps import (STATION, RecordTracker, all_record_breakers,
+                            record_breakers, yearly_record_breakers)
 from high_low_temps import high_low_record_breakers_for_2015 as hl_2015
 
 
@@ -28,4 +30,89 @@ def test_low_hl_2015(high_low):
     low = high_low[1]
     assert low.ID == "USW00094889"
     assert low.Date == datetime.date(2015, 2, 20)
-    assert low.Value == -34.3
\ No newline at end of file
+    assert low.Value == -34.3
+
+
+@pytest.fixture
+def observations():
+    rows = [
+        ("A", "2012-02-29", -50),
+        ("A", "2013-07-01", 300),
+        ("A", "2014-07-01", 310),
+        ("A", "2015-07-01", 320),
+        ("A", "2015-07-01", -10),
+        ("A", "2016-02-29", -60),
+        ("A", "2016-07-01", 320),
+        ("B", "2014-01-05", -200),
+        ("B", "2015-01-05", -250),
+        ("B", "2015-01-06", -400),
+        ("B", "2014-07-01", 100),
+        ("B", "2015-07-01", 320),
+        ("C", "2014-01-05", 0),
+        ("C", "2015-01-05", -250),
+    ]
+    df = pd.DataFrame(rows, columns=["ID", "Date", "Data_Value"])
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def test_record_breakers(observations):
+    high, low = record_breakers(2015, observations)
+    # ties go to the first station, the day without history is skipped
+    assert high == STATION("A", datetime.date(2015, 7, 1), 32.0)
+    assert low == STATION("B", datetime.date(2015, 1, 5), -25.0)
+
+
+def test_record_breakers_other_years_and_stations(observations):
+    assert record_breakers(2016, observations) == (
+        None,
+        STATION("A", datetime.date(2016, 2, 29), -6.0),
+    )
+    assert record_breakers(2015, observations, stations=["C"]) == (
+        None,
+        STATION("C", datetime.date(2015, 1, 5), -25.0),
+    )
+    assert record_breakers(2012, observations) == (None, None)
+
+
+def test_record_breakers_csv_chunks(observations, tmp_path):
+    csv = tmp_path / "weather.csv"
+    observations.assign(Element="TMAX").to_csv(csv, index=False)
+    expected = record_breakers(2015, observations, stations=["A", "B"])
+    assert record_breakers(2015, str(csv), stations=["A", "B"]) == expected
+    assert record_breakers(2015, str(csv), stations=["A", "B"], chunksize=3) == expected
+
+
+def test_all_record_breakers(observations):
+    tracker, events = all_record_breakers(observations)
+    assert events.values.tolist() == [
+        [pd.Timestamp("2014-07-01"), "A", "high", 31.0, 30.0],
+        [pd.Timestamp("2015-01-05"), "B", "low", -25.0, -20.0],
+        [pd.Timestamp("2015-01-05"), "C", "low", -25.0, 0.0],
+        [pd.Timestamp("2015-07-01"), "A", "high", 32.0, 31.0],
+        [pd.Timestamp("2015-07-01"), "A", "low", -1.0, 30.0],
+        [pd.Timestamp("2015-07-01"), "B", "high", 32.0, 10.0],
+        [pd.Timestamp("2016-02-29"), "A", "low", -6.0, -5.0],
+    ]
+    assert yearly_record_breakers(events) == {
+        year: record_breakers(year, observations) for year in (2014, 2015, 2016)
+    }
+    assert record_breakers(2013, observations) == (None, None)
+
+
+def test_record_tracker_incremental(observations):
+    _, expected = all_record_breakers(observations)
+    tracker = RecordTracker()
+    events = [tracker.update(day) for _, day in observations.groupby("Date")]
+    assert pd.concat(events).values.tolist() == expected.values.tolist()
+    assert tracker.update(observations.iloc[:0]).empty
+
+    with pytest.raises(ValueError):
+        tracker.update(observations.iloc[:1])
+
+    new_day = pd.DataFrame(
+        {"ID": ["A", "D"], "Date": pd.to_datetime(["2017-07-01"] * 2), "Data_Value": [330, 500]}
+    )
+    assert tracker.update(new_day).values.tolist() == [
+        [pd.Timestamp("2017-07-01"), "A", "high", 33.0, 32.0]
+    ]
@@ -1,18 +1,87 @@
+import os
+from pathlib import Path
+from urllib.request import urlretrieve
+
 import pandas as pd
 
 data = "https://s3.us-east-2.amazonaws.com/bites-data/menu.csv"
-# load the data in once, functions will use this module object
-df = pd.read_csv(data)
+TMP = Path(os.getenv("TMP", "/tmp"))
+MENU_FILE = TMP / "menu.csv"
+DRINKS = ('Coffee & Tea', 'Beverages')
 
 pd.options.mode.chained_assignment = None  # ignore warnings
 
 
-def get_food_most_calories(df=df):
+def ratio_column(df, numerator, denominator):
+    """Vectorized numerator/denominator column, NaN where the
+       denominator is not positive"""
+    return df[numerator] / df[denominator].where(df[denominator] > 0)
+
+
+class MenuStore:
+    """The menu DataFrame, loaded on first use from a local copy of
+       url (downloaded once to path) and kept together with the ratio
+       columns computed from it so far."""
+
+    def __init__(self, url=data, path=MENU_FILE):
+        self.url = url
+        self.path = Path(path)
+        self._df = None
+        self._ratios = {}
+
+    @property
+    def df(self):
+        if self._df is None:
+            if not self.path.exists():
+                urlretrieve(self.url, self.path)
+            self._df = pd.read_csv(self.path)
+        return self._df
+
+    def refresh(self):
+        """Download the menu again and drop everything computed from it"""
+        urlretrieve(self.url, self.path)
+        self._df = None
+        self._ratios.clear()
+        return self.df
+
+    def ratio(self, numerator, denominator):
+        key = numerator, denominator
+        if key not in self._ratios:
+            self._ratios[key] = ratio_column(self.df, numerator, denominator)
+        return self._ratios[key]
+
+
+store = MenuStore()
+
+
+def __getattr__(name):
+    # the module level df is loaded on first access instead of at import
+    if name == 'df':
+        return store.df
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_food_most_calories(df=None):
     """Return the food "Item" string with most calories"""
+    if df is None:
+        df = store.df
     return df[df.Calories == df.Calories.max()].Item.values[0]
 
 
-def get_bodybuilder_friendly_foods(df=df, excl_drinks=False):
+def top_n_by_ratio(numerator, denominator, n=5, exclude_categories=(), df=None):
+    """Return the n food Items with the highest numerator/denominator
+       ratio, skipping foods with a denominator of 0 or less and those
+       in exclude_categories. Ratios of the store's menu are cached."""
+    if df is None:
+        df, ratio = store.df, store.ratio(numerator, denominator)
+    else:
+        ratio = ratio_column(df, numerator, denominator)
+    if exclude_categories:
+        ratio = ratio[~df.Category.isin(exclude_categories)]
+    return df.Item[ratio.dropna().nlargest(n).index].tolist()
+
+
+def get_bodybuilder_friendly_foods(df=None, excl_drinks=False):
     """Calulate the Protein/Calories ratio of foods and return the
        5 foods with the best ratio.
 
@@ -23,9 +92,5 @@ def get_bodybuilder_friendly_foods(df=df, excl_drinks=False):
        right results.
 
        Return a list of the top 5 foot Item stings."""
-    filter_df = df[df.Calories > 0]
-    if excl_drinks:
-        filter_df = filter_df[~filter_df.Category.isin(['Coffee & Tea', 'Beverages'])]
-    filter_df['Protein/Calories ratio'] = filter_df.apply(lambda x: x['Protein'] / x['Calories'], axis=1)
-    sorted_df = filter_df.sort_values(by='Protein/Calories ratio', ascending=False)
-    return sorted_df[['Item']].head(5).values.ravel().tolist()
+    return top_n_by_ratio('Protein', 'Calories', 5,
+                          DRINKS if excl_drinks else (), df)
@@ -1,6 +1,10 @@
-from mcdonalds import (df,
-                       get_food_most_calories,
-                       get_bodybuilder_friendly_foods)
+import pytest
+
+import mcdonalds
+from mcdonalds import (get_food_most_calories,
+                       get_bodybuilder_friendly_foods,
+                       MenuStore,
+                       top_n_by_ratio)
 
 ASSERT_ERROR = ("One or more expected foods not in "
                 "get_bodybuilder_friendly_foods's return value")
@@ -14,6 +18,7 @@ def test_get_food_most_calories():
 
 def test_get_food_most_calories_smaller_population():
     """Extra test to prevent hardcoding the return value"""
+    df = mcdonalds.df
     df_breakfast = df[df['Category'] == 'Breakfast']
 
     actual = get_food_most_calories(df_breakfast)
@@ -38,4 +43,44 @@ def test_get_bodybuilder_friendly_foods_excluding_liquid_food():
                 'Premium Grilled Chicken Classic Sandwich',
                 'Premium Grilled Chicken Ranch BLT Sandwich',
                 'Premium Grilled Chicken Club Sandwich']
-    assert all(food in actual_wo_drinks for food in expected), ASSERT_ERROR
\ No newline at end of file
+    assert all(food in actual_wo_drinks for food in expected), ASSERT_ERROR
+
+
+@pytest.fixture
+def menu_store(tmp_path, monkeypatch):
+    menu = tmp_path / "menu.csv"
+    menu.write_text("Category,Item,Calories,Protein,Total Fat\n"
+                    "Breakfast,Egg McMuffin,300,17,13\n"
+                    "Beverages,Diet Coke,0,0,0\n"
+                    "Coffee & Tea,Nonfat Latte,100,10,0\n"
+                    "Salads,Side Salad,20,1,0\n"
+                    "Snacks,Apple Slices,15,0,0\n")
+    store = MenuStore(menu.as_uri(), tmp_path / "cache" / "menu.csv")
+    (tmp_path / "cache").mkdir()
+    monkeypatch.setattr(mcdonalds, "store", store)
+    return store
+
+
+def test_menu_store_loads_lazily_and_refreshes(menu_store, tmp_path):
+    assert not menu_store.path.exists()
+    assert get_food_most_calories() == "Egg McMuffin"
+    assert menu_store.path.exists()
+    first = menu_store.df
+    assert menu_store.df is first
+
+    with open(tmp_path / "menu.csv", "a") as f:
+        f.write("Breakfast,Big Breakfast,1000,36,48\n")
+    assert menu_store.df is first
+    assert get_food_most_calories(menu_store.refresh()) == "Big Breakfast"
+
+
+def test_top_n_by_ratio(menu_store):
+    assert get_bodybuilder_friendly_foods() == [
+        "Nonfat Latte", "Egg McMuffin", "Side Salad", "Apple Slices"]
+    assert get_bodybuilder_friendly_foods(excl_drinks=True) == [
+        "Egg McMuffin", "Side Salad", "Apple Slices"]
+    assert top_n_by_ratio("Total Fat", "Calories", 1) == ["Egg McMuffin"]
+    assert top_n_by_ratio("Protein", "Calories", 2, ["Coffee & Tea", "Breakfast"]) == [
+        "Side Salad", "Apple Slices"]
+    breakfast = menu_store.df[menu_store.df.Category == "Breakfast"]
+    assert top_n_by_ratio("Protein", "Calories", df=breakfast) == ["Egg McMuffin"]
@@ -0,0 +1,73 @@
+"""Report timings on a synthetic million-row order book.
+
+Run with: python bench_orders.py [rows, default 1000000]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from orders import (convert_excel, get_year_region_breakdown,
+                    get_best_sales_rep, get_most_sold_item)
+
+
+def order_book(rows, seed=183):
+    rnd = np.random.default_rng(seed)
+    units = rnd.integers(1, 100, rows)
+    unit_cost = rnd.choice([1.29, 1.99, 4.99, 8.99, 19.99, 125.0, 275.0], rows)
+    return pd.DataFrame({
+        'OrderDate': pd.Timestamp('2018-01-01')
+        + pd.to_timedelta(rnd.integers(0, 730, rows), unit='D'),
+        'Region': rnd.choice(['East', 'Central', 'West'], rows),
+        'Rep': rnd.choice(['Kivell', 'Jones', 'Gill', 'Sorvino', 'Jardine',
+                           'Andrews', 'Thompson', 'Howard', 'Morgan',
+                           'Parent', 'Smith'], rows),
+        'Item': rnd.choice(['Binder', 'Pencil', 'Pen', 'Desk', 'Pen Set'], rows),
+        'Units': units,
+        'Unit Cost': unit_cost,
+        'Total': units * unit_cost,
+    })
+
+
+def apply_year_region_breakdown(df):
+    """The original year extraction with apply, kept for comparison."""
+    df['Year'] = df['OrderDate'].apply(lambda x: int(str(x).split('-')[0]))
+    return df.groupby(['Year', 'Region']).agg({'Total': ['sum']})
+
+
+def timed(label, func, *args):
+    start = perf_counter()
+    result = func(*args)
+    print(f'{label:<36} {(perf_counter() - start) * 1000:>10.1f} ms')
+    return result
+
+
+def main(rows=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        book = order_book(rows)
+        excel_rows = min(rows, 50_000)
+        excel = os.path.join(tmp, 'orders.xlsx')
+        book.head(excel_rows).to_excel(excel, sheet_name='SalesOrders', index=False)
+        print(f'{excel_rows:,} row workbook')
+        timed('read_excel', pd.read_excel, excel, 'SalesOrders')
+        timed('convert_excel (cold)', convert_excel, excel, tmp)
+        timed('convert_excel (warm)', convert_excel, excel, tmp)
+
+        print(f'{rows:,} row order book')
+        parquet = os.path.join(tmp, 'orders.parquet')
+        book.assign(**{column: book[column].astype('category')
+                       for column in ('Region', 'Rep', 'Item')}
+                    ).to_parquet(parquet, index=False)
+        df = timed('read_parquet', pd.read_parquet, parquet)
+        timed('year/region breakdown (apply)', apply_year_region_breakdown,
+              book.copy())
+        timed('get_year_region_breakdown', get_year_region_breakdown, df)
+        timed('get_best_sales_rep', get_best_sales_rep, df)
+        timed('get_most_sold_item', get_most_sold_item, df)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
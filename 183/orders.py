@@ -1,43 +1,76 @@
+import glob
+import hashlib
 import os
 from urllib.request import urlretrieve
 
 import pandas as pd
-import numpy as np
 
 TMP = os.getenv("TMP", "/tmp")
 EXCEL = os.path.join(TMP, 'order_data.xlsx')
-if not os.path.isfile(EXCEL):
-    urlretrieve(
-        'https://bites-data.s3.us-east-2.amazonaws.com/order_data.xlsx',
-        EXCEL
-    )
+URL = 'https://bites-data.s3.us-east-2.amazonaws.com/order_data.xlsx'
+CATEGORIES = ['Region', 'Rep', 'Item']
+
+
+def _download(url=URL, excel=EXCEL):
+    """Download the order book once, returns its local filename"""
+    if not os.path.isfile(excel):
+        urlretrieve(url, excel)
+    return excel
+
+
+def convert_excel(excel=EXCEL, cache_dir=TMP):
+    """Parse the SalesOrders sheet of excel once into a Parquet file in
+       cache_dir, keyed by the workbook's path, mtime and size, and
+       return its filename. Region, Rep and Item become categoricals.
+       Parquet files left over from older versions of the same workbook
+       (same absolute path) are removed."""
+    if excel == EXCEL:
+        _download()
+    stat = os.stat(excel)
+    path_key = hashlib.sha1(os.path.abspath(excel).encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(excel))[0]
+    prefix = f'{stem}-{path_key}-'
+    parquet = os.path.join(
+        cache_dir, f'{prefix}{stat.st_mtime_ns}-{stat.st_size}.parquet')
+    if not os.path.isfile(parquet):
+        df = pd.read_excel(excel, sheet_name='SalesOrders')
+        df[CATEGORIES] = df[CATEGORIES].astype('category')
+        tmp = f'{parquet}.tmp'
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, parquet)
+        pattern = os.path.join(glob.escape(cache_dir),
+                               f'{glob.escape(prefix)}*.parquet')
+        for stale in glob.glob(pattern):
+            if stale != parquet:
+                os.remove(stale)
+    return parquet
 
 
 def load_excel_into_dataframe(excel=EXCEL):
     """Load the SalesOrders sheet of the excel book (EXCEL variable)
        into a Pandas DataFrame and return it to the caller"""
-    return pd.read_excel(excel, sheet_name='SalesOrders')
+    return pd.read_parquet(convert_excel(excel))
 
 
 def get_year_region_breakdown(df):
     """Group the DataFrame by year and region, summing the Total
        column. You probably need to make an extra column for
        year, return the new df as shown in the Bite description"""
-    df['Year'] = df['OrderDate'].apply(lambda x: int(str(x).split('-')[0]))
-    return df.groupby(['Year', 'Region']).agg({'Total': [np.sum]})
+    year = df['OrderDate'].dt.year.rename('Year')
+    return df.groupby([year, 'Region'], observed=True).agg({'Total': ['sum']})
 
 
 def get_best_sales_rep(df):
     """Return a tuple of the name of the sales rep and
        the total of his/her sales"""
-    best_sales_df = df.groupby('Rep').sum()
-    best = best_sales_df[best_sales_df['Total'] == best_sales_df['Total'].max()]
-    return best.index.values[0], best['Total'].values[0]
+    totals = df.groupby('Rep', observed=True)['Total'].sum()
+    best = totals.idxmax()
+    return best, totals[best]
 
 
 def get_most_sold_item(df):
     """Return a tuple of the name of the most sold item
        and the number of units sold"""
-    best_df = df.groupby('Item').sum()
-    best = best_df[best_df['Units'] == best_df['Units'].max()]
-    return best.index.values[0], best['Units'].values[0]
+    units = df.groupby('Item', observed=True)['Units'].sum()
+    best = units.idxmax()
+    return best, units[best]
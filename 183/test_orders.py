@@ -1,7 +1,12 @@
+import os
+import shutil
+
+import pandas as pd
 import pytest
 from pandas.core.frame import DataFrame
 
-from orders import (load_excel_into_dataframe,
+from orders import (convert_excel,
+                    load_excel_into_dataframe,
                     get_year_region_breakdown,
                     get_best_sales_rep,
                     get_most_sold_item)
@@ -41,4 +46,62 @@ def test_get_best_sales_rep(df):
 def test_get_most_sold_item(df):
     most_sold = get_most_sold_item(df)
     assert most_sold[0] == 'Binder'
-    assert int(most_sold[1]) == 722
\ No newline at end of file
+    assert int(most_sold[1]) == 722
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    excel = tmp_path / "orders.xlsx"
+    pd.DataFrame({
+        "OrderDate": pd.to_datetime(["2018-12-31", "2019-01-01", "2019-06-01",
+                                     "2019-07-01"]),
+        "Region": ["East", "East", "West", "East"],
+        "Rep": ["Jones", "Kivell", "Jones", "Kivell"],
+        "Item": ["Pen", "Binder", "Binder", "Pen"],
+        "Units": [10, 5, 20, 1],
+        "Unit Cost": [1.5, 2.0, 2.0, 100.0],
+        "Total": [15.0, 10.0, 40.0, 100.0],
+    }).to_excel(excel, sheet_name="SalesOrders", index=False)
+    return str(excel)
+
+
+def test_convert_excel_caches_until_modified(workbook, tmp_path, monkeypatch):
+    parquet = convert_excel(workbook, str(tmp_path))
+    df = pd.read_parquet(parquet)
+    assert df.shape == (4, 7)
+    assert all(df[column].dtype == "category" for column in ("Region", "Rep", "Item"))
+
+    def read_excel(*args, **kwargs):
+        raise AssertionError("workbook parsed again")
+
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_excel", read_excel)
+        assert convert_excel(workbook, str(tmp_path)) == parquet
+
+    os.utime(workbook, ns=(0, 0))
+    new_parquet = convert_excel(workbook, str(tmp_path))
+    assert new_parquet != parquet
+    assert not os.path.exists(parquet)
+    assert list(tmp_path.glob("*.parquet")) == [tmp_path / os.path.basename(new_parquet)]
+
+
+def test_convert_excel_keeps_same_named_workbooks(workbook, tmp_path):
+    other = tmp_path / "other" / os.path.basename(workbook)
+    other.parent.mkdir()
+    shutil.copy(workbook, other)
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    first = convert_excel(workbook, str(cache))
+    second = convert_excel(str(other), str(cache))
+    assert first != second
+    assert os.path.exists(first) and os.path.exists(second)
+
+
+def test_reports_on_categoricals(workbook, tmp_path):
+    df = pd.read_parquet(convert_excel(workbook, str(tmp_path)))
+    ret = get_year_region_breakdown(df)
+    assert list(ret.index) == [(2018, "East"), (2019, "East"), (2019, "West")]
+    assert ret[("Total", "sum")].tolist() == [15.0, 110.0, 40.0]
+    assert "Year" not in df.columns
+    assert get_best_sales_rep(df) == ("Kivell", 110.0)
+    assert get_most_sold_item(df) == ("Binder", 25)
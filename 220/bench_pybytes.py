@@ -0,0 +1,48 @@
+"""Time the PythonBytes queries over a synthetic 50k episode feed.
+
+Run with: python bench_pybytes.py [episodes, default 50000]
+"""
+import sys
+from random import choice, randint, seed
+from time import perf_counter
+
+from feedparser import FeedParserDict
+
+from pybytes import PythonBytes
+
+DOMAINS = [f'https://site{idx}.com' for idx in range(500)] + [
+    'https://github.com', 'https://pybit.es', 'https://twitter.com']
+
+
+def synthetic_entries(episodes):
+    seed(220)
+    entries = []
+    for episode in range(1, episodes + 1):
+        links = ' '.join(f'{choice(DOMAINS)}/page{randint(1, 99)}'
+                         for _ in range(randint(3, 12)))
+        guest = 'Special guest: Someone. ' if episode % 7 == 0 else ''
+        entries.append(FeedParserDict(
+            itunes_episode=str(episode),
+            summary=f'<p>{guest}Sponsored by us. {links} and more text</p>',
+            itunes_duration=f'00:{randint(10, 59):02}:{randint(0, 59):02}'))
+    return entries
+
+
+def query_all(pb):
+    pb.get_episode_numbers_for_mentioned_domain('pybit.es')
+    pb.get_episode_numbers_for_mentioned_domain('site42.com')
+    pb.get_most_mentioned_domain_names()
+    pb.number_episodes_with_special_guest()
+    pb.get_average_duration_episode_in_seconds()
+
+
+def main(episodes=50_000):
+    pb = PythonBytes(entries=synthetic_entries(episodes))
+    for label in ('first round (builds index)', 'second round'):
+        start = perf_counter()
+        query_all(pb)
+        print(f'{label:<30} {perf_counter() - start:8.4f}s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
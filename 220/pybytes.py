@@ -1,10 +1,19 @@
+from bisect import bisect_right
 from collections import namedtuple, Counter
 from operator import itemgetter
+from pathlib import Path
 from typing import NamedTuple
 import re
+import sys
 
 import feedparser
 
+# feedcache is shared with bite 50 and lives in ../shared
+SHARED = str(Path(__file__).resolve().parent.parent / 'shared')
+if SHARED not in sys.path:
+    sys.path.insert(0, SHARED)
+from feedcache import FeedCache  # noqa: E402
+
 SPECIAL_GUEST = 'Special guest'
 
 # using _ as min/max are builtins
@@ -15,23 +24,130 @@ URL = 'https://bites-data.s3.us-east-2.amazonaws.com/python_bytes'
 IGNORE_DOMAINS = {'https://pythonbytes.fm', 'http://pythonbytes.fm',
                   'https://twitter.com', 'https://training.talkpython.fm',
                   'https://talkpython.fm', 'http://testandcode.com'}
+DOMAIN_RE = re.compile(r'https?://[^/]+')
+SUMMARY_SEPARATOR = '\0'
+
+
+def _duration_secs_from_str(duration_str):
+    split = duration_str.split(':')
+    return int(split[0]) * 3600 + int(split[1]) * 60 + int(split[2])
+
+
+class FeedAnalytics:
+    """Everything the PythonBytes queries need, extracted from the
+       entries in a single pass: domains per episode (and a domain ->
+       episodes posting map), special guest flags, durations in seconds
+       and their Duration, and all summaries joined into one string so
+       substring lookups run as one C level scan instead of a Python
+       loop per entry. Episodes with a missing or malformed duration
+       are left out of Duration and listed in bad_durations.
+    """
+
+    def __init__(self, entries):
+        self.episodes = []
+        self.domain_counts = Counter()
+        self.domain_episodes = {}
+        self.special_guests = 0
+        self.durations = []
+        self.bad_durations = []
+        self._summary_starts = []
+        summaries = []
+        offset = 0
+        for entry in entries:
+            episode = entry.itunes_episode
+            self.episodes.append(episode)
+            summary = entry.summary
+            self._summary_starts.append(offset)
+            summaries.append(summary)
+            offset += len(summary) + len(SUMMARY_SEPARATOR)
+            domains = [domain for domain
+                       in dict.fromkeys(DOMAIN_RE.findall(summary))
+                       if domain not in IGNORE_DOMAINS]
+            self.domain_counts.update(domains)
+            for domain in domains:
+                self.domain_episodes.setdefault(domain, []).append(episode)
+            if SPECIAL_GUEST in summary:
+                self.special_guests += 1
+            duration = entry.get('itunes_duration')
+            try:
+                self.durations.append(
+                    (_duration_secs_from_str(duration), duration))
+            except (AttributeError, IndexError, ValueError):
+                self.bad_durations.append(episode)
+        self._summaries = SUMMARY_SEPARATOR.join(summaries)
+        self._mentions = {}
+        self.duration = None
+        if self.durations:
+            self.duration = Duration(
+                sum(x[0] for x in self.durations) // len(self.durations),
+                max(self.durations, key=itemgetter(0))[1],
+                min(self.durations, key=itemgetter(0))[1])
+
+    def mentioned(self, text):
+        """Episodes whose summary contains text, cached per text."""
+        if text not in self._mentions:
+            mentions = []
+            last = -1
+            pos = self._summaries.find(text)
+            while pos != -1:
+                idx = bisect_right(self._summary_starts, pos) - 1
+                if idx != last:
+                    mentions.append(self.episodes[idx])
+                    last = idx
+                # continue after the summary we just matched
+                if idx + 1 == len(self._summary_starts):
+                    break
+                pos = self._summaries.find(text, self._summary_starts[idx + 1])
+            self._mentions[text] = mentions
+        return list(self._mentions[text])
 
 
 class PythonBytes:
 
-    def __init__(self, url=URL):
-        """Load the feed url into self.entries using the feedparser module."""
-        self.entries = feedparser.parse(url).entries
+    def __init__(self, url=URL, cache=None, entries=None):
+        """Load the feed url into self.entries using the feedparser module.
+           The feed is read through cache, a FeedCache in $TMP/feedcache
+           by default, so it is only re-parsed if it changed. Pass
+           cache=False to always parse it, or already parsed entries to
+           use those instead of the feed.
+        """
+        if entries is not None:
+            self.entries = entries
+            return
+        if cache is None:
+            cache = FeedCache()
+        if cache:
+            self.entries = cache.entries(url)
+        else:
+            self.entries = feedparser.parse(url).entries
+
+    @property
+    def entries(self):
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        self._entries = entries
+        self._analytics = None
+
+    @property
+    def analytics(self) -> FeedAnalytics:
+        """FeedAnalytics of the current entries, built on first use."""
+        if self._analytics is None:
+            self._analytics = FeedAnalytics(self._entries)
+        return self._analytics
 
     def get_episode_numbers_for_mentioned_domain(self, domain: str) -> list:
         """Return a list of episode IDs (itunes_episode attribute) of the
            episodes the pass in domain was mentioned in.
         """
-        mentions = []
-        for entry in self.entries:
-            if domain in entry.summary:
-                mentions.append(entry.itunes_episode)
-        return mentions
+        return self.analytics.mentioned(domain)
+
+    def get_episode_numbers_for_domain(self, domain: str) -> list:
+        """Return the episode IDs linking to domain, as matched by
+           DOMAIN_RE (e.g. 'https://github.com').
+        """
+        return list(self.analytics.domain_episodes.get(domain, []))
 
     def get_most_mentioned_domain_names(self, n: int = 15) -> list:
         """Get the most mentioned domain domains. We match a domain using
@@ -39,40 +155,17 @@ class PythonBytes:
            episode and ignore domains in IGNORE_DOMAINS.
            Return a list of (domain, count) tuples (use Counter).
         """
-        domain_counter = Counter()
-        for entry in self.entries:
-            domains = set()
-            matches = re.findall(r'https?://[^/]+', entry.summary)
-            if matches:
-                for match in matches:
-                    if match not in IGNORE_DOMAINS:
-                        domains.add(match)
-                domain_counter.update(domains)
-        result = domain_counter.most_common(n)
-        return result
+        return self.analytics.domain_counts.most_common(n)
 
     def number_episodes_with_special_guest(self) -> int:
         """Return the number of episodes that had one of more special guests
            featured (use SPECIAL_GUEST).
         """
-        ep_with_guest_count = sum(1 for entry in self.entries if SPECIAL_GUEST in entry.summary)
-        return ep_with_guest_count
+        return self.analytics.special_guests
 
     def get_average_duration_episode_in_seconds(self) -> NamedTuple:
         """Return the average duration in seconds of a Python Bytes episode, as
            well as the shortest and longest episode in hh:mm:ss notation.
            Return the results using the Duration namedtuple.
         """
-        def duration_secs_from_str(duration_str):
-            split = duration_str.split(':')
-            return int(split[0]) * 3600 + int(split[1]) * 60 + int(split[2])
-
-        duration_seconds = [
-            (duration_secs_from_str(entry.itunes_duration), entry.itunes_duration) 
-            for entry in self.entries
-        ]
-        min_ = min(duration_seconds, key=itemgetter(0))[1]
-        max_ = max(duration_seconds, key=itemgetter(0))[1]
-        avg = sum([x[0] for x in duration_seconds]) // len(duration_seconds)
-        result = Duration(avg, max_, min_)
-        return result
+        return self.analytics.duration
@@ -1,6 +1,6 @@
 import pytest
 
-from pybytes import Duration, PythonBytes
+from pybytes import Duration, FeedCache, PythonBytes
 
 REAL_PYTHON = "realpython.com"
 PYBITES = 'pybit.es'
@@ -91,4 +91,83 @@ def test_average_episode_duration_half_feed(pb):
     # depending the way mean is calculated, results might differ
     expected_alt = Duration(avg=1607, max_=max_, min_=min_)
     pb.entries = org_entries  # pb is module scope so restore entries
-    assert actual in (expected, expected_alt)
\ No newline at end of file
+    assert actual in (expected, expected_alt)
+
+
+def test_cached_feed(tmp_path):
+    feed = tmp_path / 'feed.xml'
+    feed.write_text(
+        '<?xml version="1.0"?><rss version="2.0" '
+        'xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>'
+        '<item><title>#1 Start</title><guid>1</guid>'
+        '<description>See https://pybit.es/ - Special guest</description>'
+        '<itunes:episode>1</itunes:episode>'
+        '<itunes:duration>00:20:00</itunes:duration></item>'
+        '</channel></rss>')
+    cache = FeedCache(tmp_path / 'cache')
+    PythonBytes(str(feed), cache=cache)
+    pb = PythonBytes(str(feed), cache=cache)
+    assert cache.parses == 1
+    assert pb.get_episode_numbers_for_mentioned_domain(PYBITES) == ['1']
+    assert pb.number_episodes_with_special_guest() == 1
+
+
+def make_entries():
+    from feedparser import FeedParserDict
+    summaries = [
+        'Special guest: Bob. https://github.com/x https://pybit.es/a '
+        'https://github.com/y https://twitter.com/z',
+        'https://realpython.com/b and http://rollbar.com/ and pybit.es',
+        'Nothing here',
+        'Special guest: Al. https://github.com/q https://realpython.com/',
+    ]
+    durations = ['00:20:00', '00:15:27', '00:56:54', '00:30:01']
+    return [FeedParserDict(itunes_episode=str(idx), summary=summary,
+                           itunes_duration=duration)
+            for idx, (summary, duration)
+            in enumerate(zip(summaries, durations), 1)]
+
+
+@pytest.fixture
+def small_pb():
+    return PythonBytes(entries=make_entries())
+
+
+def test_analytics_mentioned_domain(small_pb):
+    assert small_pb.get_episode_numbers_for_mentioned_domain(
+        PYBITES) == ['1', '2']
+    assert small_pb.get_episode_numbers_for_mentioned_domain(
+        REAL_PYTHON) == ['2', '4']
+    assert small_pb.get_episode_numbers_for_mentioned_domain('nope') == []
+    assert small_pb.get_episode_numbers_for_domain(
+        'https://github.com') == ['1', '4']
+
+
+def test_analytics_most_mentioned(small_pb):
+    assert small_pb.get_most_mentioned_domain_names(n=2) == [
+        ('https://github.com', 2), ('https://realpython.com', 2)]
+
+
+def test_analytics_special_guest_and_duration(small_pb):
+    assert small_pb.number_episodes_with_special_guest() == 2
+    assert small_pb.get_average_duration_episode_in_seconds() == Duration(
+        avg=1835, max_='00:56:54', min_='00:15:27')
+
+
+def test_analytics_rebuilt_on_new_entries(small_pb):
+    assert small_pb.number_episodes_with_special_guest() == 2
+    small_pb.entries = small_pb.entries[1:3]
+    assert small_pb.number_episodes_with_special_guest() == 0
+    assert small_pb.get_episode_numbers_for_mentioned_domain(
+        PYBITES) == ['2']
+
+
+def test_bad_durations_are_skipped():
+    entries = make_entries()
+    entries[1]['itunes_duration'] = 'n/a'
+    del entries[2]['itunes_duration']
+    pb = PythonBytes(entries=entries)
+    assert pb.get_episode_numbers_for_mentioned_domain(PYBITES) == ['1', '2']
+    assert pb.analytics.bad_durations == ['2', '3']
+    assert pb.get_average_duration_episode_in_seconds() == Duration(
+        1500, '00:30:01', '00:20:00')
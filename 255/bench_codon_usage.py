@@ -0,0 +1,39 @@
+"""Compare the Counter and numpy codon counting on a bacterial genome.
+
+Run with: python bench_codon_usage.py [megabases, default 5]
+"""
+import random
+import sys
+from collections import Counter
+from time import perf_counter
+
+from codon_usage import BASE_ORDER, count_codons, get_codons
+
+
+def synthetic_genes(megabases):
+    rnd = random.Random(255)
+    genes, total = [], 0
+    while total < megabases * 1_000_000:
+        gene = ''.join(rnd.choices(BASE_ORDER, k=3 * rnd.randint(100, 600)))
+        genes.append(gene + '\n')
+        total += len(gene)
+    return genes
+
+
+def timed(label, func, *args):
+    start = perf_counter()
+    result = func(*args)
+    print(f'{label:<25} {perf_counter() - start:8.3f}s')
+    return result
+
+
+def main(megabases=5):
+    genes = synthetic_genes(megabases)
+    print(f'{len(genes):,} genes, {megabases} Mb')
+    expected = timed('Counter(get_codons)', lambda: Counter(get_codons(genes)))
+    counts = timed('count_codons (numpy)', count_codons, genes)
+    assert counts == expected
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1,5 +1,7 @@
+import mmap
 import os
 from collections import Counter
+from itertools import product
 from urllib.request import urlretrieve
 
 # Translation Table:
@@ -23,18 +25,48 @@ URL = "https://bites-data.s3.us-east-2.amazonaws.com/NC_009641.txt"
 
 # Order of bases in the table
 BASE_ORDER = ["U", "C", "A", "G"]
+# Counter key for codons containing anything but BASE_ORDER letters,
+# they only count towards the total number of codons
+INVALID_CODON = None
 
 
-def _preload_sequences(url=URL):
-    """
-    Provided helper function
-    Returns coding sequences, one sequence each line
-    """
+CHUNK_BYTES = 1 << 22
+
+
+def _download(url=URL):
+    """Download the sequences file once, returns its local filename"""
     filename = os.path.join(os.getenv("TMP", "/tmp"), "NC_009641.txt")
     if not os.path.isfile(filename):
         urlretrieve(url, filename)
-    with open(filename, "r") as f:
-        return f.readlines()
+    return filename
+
+
+def iter_sequences(filename):
+    """
+    Lazily yield the sequences of filename, one per line like readlines,
+    from a memory map so the file is never held in memory as a whole
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                if line.endswith(b"\r\n"):
+                    line = line[:-2] + b"\n"
+                yield line.decode("ascii", "replace")
+
+
+def iter_sequence_chunks(filename, chunk_bytes=CHUNK_BYTES):
+    """Group the sequences of filename into lists of about chunk_bytes"""
+    chunk, size = [], 0
+    for sequence in iter_sequences(filename):
+        chunk.append(sequence)
+        size += len(sequence)
+        if size >= chunk_bytes:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
 
 
 def extract_translation_table(translation_table_str):
@@ -58,8 +90,52 @@ def get_codons(sequences):
     return codons
 
 
+def count_codons(sequences):
+    """Vectorized Counter(get_codons(sequences)), needs numpy.
+
+    Every base is mapped to a 2-bit code (index in BASE_ORDER) and each
+    triplet folded into a codon id 0-63 that is counted with bincount.
+    Codons are read per sequence from its first base, like get_codons.
+    """
+    import numpy as np
+
+    sequences = list(sequences)
+    if sum(len(sequence) // 3 for sequence in sequences) == 0:
+        return Counter()
+    lengths = np.fromiter((len(sequence) for sequence in sequences),
+                          dtype=np.int64)
+    data = ''.join(sequences).encode('ascii', 'replace')
+    codes = np.full(256, len(BASE_ORDER), dtype=np.uint8)
+    for code, base in enumerate(BASE_ORDER):
+        codes[ord(base)] = code
+    bases = codes[np.frombuffer(data, dtype=np.uint8)]
+
+    # start position of every codon, restarting the frame at each sequence
+    codons_per_sequence = lengths // 3
+    sequence_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    first_codon = np.concatenate(([0], np.cumsum(codons_per_sequence)[:-1]))
+    total = int(codons_per_sequence.sum())
+    starts = (np.repeat(sequence_starts - 3 * first_codon, codons_per_sequence)
+              + 3 * np.arange(total))
+
+    first, second, third = bases[starts], bases[starts + 1], bases[starts + 2]
+    ids = (first.astype(np.int64) * 16 + second * 4 + third)
+    ids[(first | second | third) > 3] = 64
+    counts = np.bincount(ids, minlength=65)
+
+    codon_counter = Counter()
+    for codon_id, codon in enumerate(map(''.join, product(BASE_ORDER,
+                                                          repeat=3))):
+        if counts[codon_id]:
+            codon_counter[codon] = int(counts[codon_id])
+    if counts[64]:
+        codon_counter[INVALID_CODON] = int(counts[64])
+    return codon_counter
+
+
 def generate_codon_usage_table(translation_table, codons):
-    codon_counter = Counter(codons)
+    """codons is an iterable of codons or a Counter from count_codons"""
+    codon_counter = codons if isinstance(codons, Counter) else Counter(codons)
     total_codon_count = sum(codon_counter.values())
 
     output = []
@@ -86,8 +162,42 @@ def generate_codon_usage_table(translation_table, codons):
 
 
 
+class CodonUsageAccumulator:
+    """
+    Incrementally counts codons of sequences, files or other accumulators
+    (e.g. from worker processes), then renders the usage table
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add_sequences(self, sequences):
+        try:
+            self.counts.update(count_codons(sequences))
+        except ImportError:
+            self.counts.update(get_codons(sequences))
+        return self
+
+    def add_file(self, filename, chunk_bytes=CHUNK_BYTES):
+        """Count a sequences file chunk by chunk"""
+        for chunk in iter_sequence_chunks(filename, chunk_bytes):
+            self.add_sequences(chunk)
+        return self
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def table(self, translation_table_str=TRANSL_TABLE_11):
+        translation_table = extract_translation_table(translation_table_str)
+        return generate_codon_usage_table(translation_table, self.counts)
+
+
 def return_codon_usage_table(
-    sequences=_preload_sequences(), translation_table_str=TRANSL_TABLE_11
+    sequences=None, translation_table_str=TRANSL_TABLE_11
 ):
     """
     Receives a list of gene sequences and a translation table string
@@ -97,11 +207,17 @@ def return_codon_usage_table(
 
     Skip invalid coding sequences:
        --> must consist entirely of codons (3-base triplet)
+
+    Without sequences the NC_009641 file is downloaded (once) and
+    streamed through a CodonUsageAccumulator.
     """
-    translation_table = extract_translation_table(translation_table_str)
-    codons = get_codons(sequences)
-    return generate_codon_usage_table(translation_table, codons)
+    accumulator = CodonUsageAccumulator()
+    if sequences is None:
+        accumulator.add_file(_download())
+    else:
+        accumulator.add_sequences(sequences)
+    return accumulator.table(translation_table_str)
 
 
 if __name__ == "__main__":
-    print(return_codon_usage_table())
\ No newline at end of file
+    print(return_codon_usage_table())
@@ -1,4 +1,6 @@
+import random
 import re
+from collections import Counter
 
 import pytest
 
@@ -139,4 +141,79 @@ def test_table(result, function):
     Helper function to run all tests
     """
     print(f"Executing function '{function.__name__}'")
-    assert function(result) == function(EXPECTED)
\ No newline at end of file
+    assert function(result) == function(EXPECTED)
+
+
+def random_sequences(count, invalid=''):
+    rnd = random.Random(255)
+    bases = ''.join(codon_usage.BASE_ORDER) + invalid
+    return [''.join(rnd.choice(bases) for _ in range(rnd.randint(0, 300)))
+            + rnd.choice(['\n', ''])
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("invalid", ['', 'TN-'])
+def test_count_codons(invalid):
+    pytest.importorskip("numpy")
+    sequences = random_sequences(200, invalid)
+    expected = Counter(codon_usage.get_codons(sequences))
+    counts = codon_usage.count_codons(sequences)
+    assert sum(counts.values()) == sum(expected.values())
+    for codon, count in expected.items():
+        if set(codon) <= set(codon_usage.BASE_ORDER):
+            assert counts[codon] == count
+
+
+def test_count_codons_empty():
+    pytest.importorskip("numpy")
+    assert codon_usage.count_codons([]) == Counter()
+    assert codon_usage.count_codons(['AU', '\n']) == Counter()
+
+
+def test_count_codons_same_table():
+    pytest.importorskip("numpy")
+    sequences = random_sequences(200, 'T')
+    table = codon_usage.extract_translation_table(codon_usage.TRANSL_TABLE_11)
+    assert codon_usage.generate_codon_usage_table(
+        table, codon_usage.count_codons(sequences)
+    ) == codon_usage.generate_codon_usage_table(
+        table, codon_usage.get_codons(sequences))
+
+
+@pytest.fixture
+def sequences_file(tmp_path):
+    path = tmp_path / "sequences.txt"
+    path.write_text("".join(random_sequences(300, "T")))
+    return path
+
+
+def test_iter_sequences(sequences_file):
+    with open(sequences_file) as f:
+        expected = f.readlines()
+    assert list(codon_usage.iter_sequences(sequences_file)) == expected
+    chunks = list(codon_usage.iter_sequence_chunks(sequences_file, 2000))
+    assert len(chunks) > 1
+    assert [line for chunk in chunks for line in chunk] == expected
+
+
+def test_iter_sequences_crlf_and_empty(tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"AUG\r\nUUU\r\n")
+    assert list(codon_usage.iter_sequences(path)) == ["AUG\n", "UUU\n"]
+    path.write_bytes(b"")
+    assert list(codon_usage.iter_sequences(path)) == []
+
+
+def test_accumulator(sequences_file):
+    with open(sequences_file) as f:
+        sequences = f.readlines()
+    expected = codon_usage.return_codon_usage_table(sequences)
+
+    streamed = codon_usage.CodonUsageAccumulator()
+    streamed.add_file(sequences_file, chunk_bytes=1000)
+    assert streamed.table() == expected
+
+    first = codon_usage.CodonUsageAccumulator().add_sequences(sequences[:100])
+    second = codon_usage.CodonUsageAccumulator().add_sequences(sequences[100:])
+    first += second
+    assert first.table() == expected
@@ -0,0 +1,120 @@
+"""Reverse complement all records of a (gzipped) FASTA file.
+
+Records are streamed from the input, handed out in batches to a pool of
+worker processes and written back in input order. At most a fixed number
+of batches is in flight, so memory stays bounded however big the file is.
+
+    python fasta_revcomp.py genome.fa.gz -o genome_rc.fa
+"""
+import argparse
+import gzip
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from reverse_complement import (IUPAC_COMPLEMENTS_STR, LINE_WIDTH,
+                                read_records, reverse_complement,
+                                write_wrapped)
+
+BATCH_BYTES = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+# gzip.open defaults to level 9, which would dominate the run time
+GZIP_LEVEL = 6
+
+
+def open_fasta(path, mode='r'):
+    """Open path as text, transparently (de)compressing gzip files"""
+    if mode == 'r':
+        with open(path, 'rb') as f:
+            gzipped = f.read(2) == GZIP_MAGIC
+    else:
+        gzipped = str(path).endswith('.gz')
+    if gzipped:
+        return gzip.open(path, mode + 't', compresslevel=GZIP_LEVEL)
+    return open(path, mode)
+
+
+def batch_records(records, batch_bytes=BATCH_BYTES):
+    """Group records into lists holding about batch_bytes of sequence"""
+    batch, size = [], 0
+    for record in records:
+        batch.append(record)
+        size += len(record[1])
+        if size >= batch_bytes:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def _reverse_complement_batch(batch, str_table):
+    return [(header, reverse_complement(sequence, str_table))
+            for header, sequence in batch]
+
+
+def reverse_complement_records(records, str_table=IUPAC_COMPLEMENTS_STR,
+                               workers=None, batch_bytes=BATCH_BYTES,
+                               max_pending=None):
+    """Yield the reverse complemented records in input order, computed
+       in a process pool with at most max_pending batches in flight
+    """
+    workers = workers or os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for batch in batch_records(records, batch_bytes):
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_reverse_complement_batch,
+                                           batch, str_table))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_record(out, header, sequence, line_width=LINE_WIDTH):
+    if header is not None:
+        out.write(header + '\n')
+    write_wrapped(out, [sequence], line_width, newline='\n')
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        description='Reverse complement every record of a FASTA file')
+    parser.add_argument('fasta', help='input FASTA file, may be gzipped')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file (.gz to compress), default stdout')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('--line-width', type=int, default=LINE_WIDTH,
+                        help='bases per output line, 0 for no wrapping')
+    return parser
+
+
+def main(args=None):
+    args = create_parser().parse_args(args)
+    start = perf_counter()
+    records = bases = 0
+    with open_fasta(args.fasta) as fasta:
+        out = (sys.stdout if args.output == '-'
+               else open_fasta(args.output, 'w'))
+        try:
+            for header, sequence in reverse_complement_records(
+                    read_records(fasta), workers=args.workers):
+                write_record(out, header, sequence, args.line_width)
+                records += 1
+                bases += len(sequence)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    elapsed = perf_counter() - start
+    megabytes = bases / 1_000_000
+    print(f'{records} records, {megabytes:.1f} MB in {elapsed:.2f}s '
+          f'({megabytes / elapsed if elapsed else 0:.1f} MB/s)',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
 import csv
+import mmap
+import os
+from collections import namedtuple
+from functools import lru_cache
 
 # See tests for a more comprehensive complementary table
 SIMPLE_COMPLEMENTS_STR = """#Reduced table with bases A, G, C, T
@@ -9,6 +13,46 @@ SIMPLE_COMPLEMENTS_STR = """#Reduced table with bases A, G, C, T
  C	G
 """
 
+# IUPAC table including ambiguous bases, from
+# http://arep.med.harvard.edu/labgc/adnan/projects/Utilities/revcomp.html
+IUPAC_COMPLEMENTS_STR = """# Full table with ambigous bases
+ Base	Name	Bases Represented	Complementary Base
+ A	Adenine	A	T
+ T	Thymidine	T 	A
+ U	Uridine(RNA only)	U	A
+ G	Guanidine	G	C
+ C	Cytidine	C	G
+ Y	pYrimidine	C T	R
+ R	puRine	A G	Y
+ S	Strong(3Hbonds)	G C	S
+ W	Weak(2Hbonds)	A T	W
+ K	Keto	T/U G	M
+ M	aMino	A C	K
+ B	not A	C G T	V
+ D	not C	A G T	H
+ H	not G	A C T	D
+ V	not T/U	A C G	B
+ N	Unknown	A C G T	N
+"""
+
+BLOCK_SIZE = 1 << 20
+LINE_WIDTH = 60
+
+# Everything derived from one str_table: the base mapping plus
+# str.translate / bytes.translate tables that upper case, complement
+# (or keep) valid bases and delete all other characters in one pass
+CompiledTable = namedtuple(
+    'CompiledTable',
+    'mapping clean complement bytes_complement bytes_delete')
+
+
+class _DeleteMissing(dict):
+    """str.translate table deleting every character it has no entry for"""
+
+    def __missing__(self, key):
+        self[key] = None
+        return None
+
 
 def get_base_mapping(str_table):
     str_table_lines = str_table.split('\n')
@@ -20,6 +64,25 @@ def get_base_mapping(str_table):
     return mapping
 
 
+@lru_cache(maxsize=32)
+def compile_table(str_table=SIMPLE_COMPLEMENTS_STR):
+    """Parse str_table once and build its translation tables (cached)"""
+    mapping = get_base_mapping(str_table)
+    clean, complement = _DeleteMissing(), _DeleteMissing()
+    bytes_complement = bytearray(range(256))
+    valid = set()
+    for base, complementary in mapping.items():
+        for char in {base, base.lower()}:
+            clean[ord(char)] = base
+            complement[ord(char)] = complementary
+            if char.isascii() and complementary.isascii():
+                bytes_complement[ord(char)] = ord(complementary)
+                valid.add(ord(char))
+    bytes_delete = bytes(code for code in range(256) if code not in valid)
+    return CompiledTable(mapping, clean, complement, bytes(bytes_complement),
+                         bytes_delete)
+
+
 # Recommended helper function
 def _clean_sequence(sequence, base_mapping):
     """
@@ -40,8 +103,7 @@ def reverse(sequence, str_table=SIMPLE_COMPLEMENTS_STR):
     not found in str_table characters
     e.g. t!t%ttttAACCG --> GCCAATTTTTT
     """
-    base_mapping = get_base_mapping(str_table)
-    return _clean_sequence(sequence[::-1], base_mapping)
+    return sequence.translate(compile_table(str_table).clean)[::-1]
 
 
 def complement(sequence, str_table=SIMPLE_COMPLEMENTS_STR):
@@ -52,8 +114,7 @@ def complement(sequence, str_table=SIMPLE_COMPLEMENTS_STR):
     str_table while removing non input_sequence characters
     e.g. t!t%ttttAACCG --> AAAAAATTGGC
     """
-    base_mapping = get_base_mapping(str_table)
-    return ''.join(base_mapping[c] for c in _clean_sequence(sequence, base_mapping))
+    return sequence.translate(compile_table(str_table).complement)
 
 
 def reverse_complement(sequence, str_table=SIMPLE_COMPLEMENTS_STR):
@@ -65,3 +126,97 @@ def reverse_complement(sequence, str_table=SIMPLE_COMPLEMENTS_STR):
     e.g. t!t%ttttAACCG --> CGGTTAAAAAA
     """
     return complement(sequence, str_table)[::-1]
+
+
+def read_records(lines):
+    """Yield (header, sequence) tuples from FASTA lines, header is None
+       for sequence lines before the first '>' line
+    """
+    header, sequence = None, []
+    for line in lines:
+        if line.startswith('>'):
+            if header is not None or sequence:
+                yield header, ''.join(sequence)
+            header, sequence = line.rstrip('\r\n'), []
+        else:
+            sequence.append(line.rstrip('\r\n'))
+    if header is not None or sequence:
+        yield header, ''.join(sequence)
+
+
+def _records(mapped):
+    """Yield (header, start, end) of every FASTA record in mapped, header
+       is None for a plain sequence file without '>' lines. The same
+       records as read_records, as offsets into a memory map.
+    """
+    size = len(mapped)
+    if mapped[:1] != b'>':
+        end = mapped.find(b'\n>')
+        yield None, 0, size if end == -1 else end + 1
+        if end == -1:
+            return
+        pos = end + 1
+    else:
+        pos = 0
+    while pos < size:
+        header_end = mapped.find(b'\n', pos)
+        if header_end == -1:
+            yield mapped[pos:], size, size
+            return
+        end = mapped.find(b'\n>', header_end)
+        end = size if end == -1 else end + 1
+        yield mapped[pos:header_end + 1], header_end + 1, end
+        pos = end
+
+
+def write_wrapped(out, blocks, line_width, newline=b'\n'):
+    """Write blocks to out, broken into lines of line_width (0 for one
+       line). Blocks are bytes by default, pass newline='\n' for str.
+    """
+    if not line_width:
+        written = False
+        for block in blocks:
+            out.write(block)
+            written = written or bool(block)
+        if written:
+            out.write(newline)
+        return
+    pending = newline[:0]
+    for block in blocks:
+        pending += block
+        full = len(pending) // line_width * line_width
+        if full:
+            out.write(newline.join(pending[idx:idx + line_width]
+                                   for idx in range(0, full, line_width)))
+            out.write(newline)
+        pending = pending[full:]
+    if pending:
+        out.write(pending + newline)
+
+
+def reverse_complement_file(in_path, out_path, str_table=SIMPLE_COMPLEMENTS_STR,
+                            block_size=BLOCK_SIZE, line_width=LINE_WIDTH):
+    """
+    Reverse complement every record of a (multi gigabyte) FASTA or plain
+    sequence file into out_path, keeping the headers. The input is memory
+    mapped and each record is read backwards in blocks of block_size, so
+    memory use does not depend on the file size.
+    """
+    table = compile_table(str_table)
+
+    def blocks(mapped, start, end):
+        while end > start:
+            block_start = max(start, end - block_size)
+            yield mapped[block_start:end].translate(
+                table.bytes_complement, table.bytes_delete)[::-1]
+            end = block_start
+
+    with open(in_path, 'rb') as f, open(out_path, 'wb') as out:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for header, start, end in _records(mapped):
+                if header is not None:
+                    out.write(header if header.endswith(b'\n')
+                              else header + b'\n')
+                write_wrapped(out, blocks(mapped, start, end), line_width)
@@ -0,0 +1,57 @@
+import gzip
+
+import pytest
+
+from fasta_revcomp import (batch_records, main, read_records,
+                           reverse_complement_records)
+from reverse_complement import IUPAC_COMPLEMENTS_STR, reverse_complement
+
+FASTA = """>seq1 some gene
+ACGTRYKM
+NNacgt
+>seq2
+TTTAAAGGGCCC
+>empty
+>seq3
+gattaca
+"""
+
+
+def test_read_records():
+    assert list(read_records(FASTA.splitlines(keepends=True))) == [
+        ('>seq1 some gene', 'ACGTRYKMNNacgt'),
+        ('>seq2', 'TTTAAAGGGCCC'),
+        ('>empty', ''),
+        ('>seq3', 'gattaca'),
+    ]
+    assert list(read_records(['ACGT\n', 'AA\n'])) == [(None, 'ACGTAA')]
+
+
+def test_batch_records():
+    records = [(str(idx), 'A' * 10) for idx in range(7)]
+    batches = list(batch_records(records, batch_bytes=25))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+
+def test_reverse_complement_records_in_order():
+    records = [(f'>{idx}', 'ACGTN' * idx + 'G') for idx in range(50)]
+    result = list(reverse_complement_records(
+        records, workers=2, batch_bytes=20, max_pending=2))
+    assert result == [(header, reverse_complement(sequence,
+                                                  IUPAC_COMPLEMENTS_STR))
+                      for header, sequence in records]
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+def test_main(tmp_path, capsys, suffix):
+    fasta = tmp_path / f"in.fa{suffix}"
+    output = tmp_path / f"out.fa{suffix}"
+    opener = gzip.open if suffix else open
+    with opener(fasta, "wt") as f:
+        f.write(FASTA)
+    main([str(fasta), "-o", str(output), "-w", "2", "--line-width", "5"])
+    with opener(output, "rt") as f:
+        assert f.read() == (">seq1 some gene\nACGTN\nNKMRY\nACGT\n"
+                            ">seq2\nGGGCC\nCTTTA\nAA\n>empty\n"
+                            ">seq3\nTGTAA\nTC\n")
+    assert "4 records" in capsys.readouterr().err
@@ -253,4 +253,64 @@ def test_dirty_reverse_complement_new_table(input_sequence, expected):
             input_sequence, COMPLEMENTS_STR
         ).upper()
         == expected
-    )
\ No newline at end of file
+    )
+
+# ############################################################################
+# Compiled tables and file based reverse complement
+# ############################################################################
+
+
+def test_compile_table_cached():
+    table = reverse_complement.compile_table(COMPLEMENTS_STR)
+    assert reverse_complement.compile_table(COMPLEMENTS_STR) is table
+    assert table.mapping == reverse_complement.get_base_mapping(
+        COMPLEMENTS_STR)
+
+
+@pytest.mark.parametrize("str_table", [
+    reverse_complement.SIMPLE_COMPLEMENTS_STR, COMPLEMENTS_STR])
+@pytest.mark.parametrize("sequence", ACGT_BASES_ONLY + MIXED_CASE_DNA
+                         + DIRTY_DNA + ["", "ürnä\tyb?"])
+def test_translate_matches_clean_sequence(sequence, str_table):
+    mapping = reverse_complement.get_base_mapping(str_table)
+    cleaned = reverse_complement._clean_sequence(sequence, mapping)
+    assert reverse_complement.reverse(sequence, str_table) == cleaned[::-1]
+    assert reverse_complement.complement(sequence, str_table) == "".join(
+        mapping[base] for base in cleaned)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 20])
+@pytest.mark.parametrize("line_width", [None, 5, 60])
+def test_reverse_complement_file(tmp_path, block_size, line_width):
+    records = [(">seq1 first\n", ACGT_BASES_ONLY[2]),
+               (">seq2\n", MIXED_CASE_DNA[1]),
+               (">empty\n", "")]
+    fasta = tmp_path / "in.fasta"
+    fasta.write_text("".join(
+        header + "\n".join(sequence[i:i + 70]
+                           for i in range(0, len(sequence), 70))
+        + ("\n" if sequence else "")
+        for header, sequence in records))
+    out = tmp_path / "out.fasta"
+    reverse_complement.reverse_complement_file(
+        fasta, out, COMPLEMENTS_STR, block_size=block_size,
+        line_width=line_width)
+
+    expected = []
+    for header, sequence in records:
+        expected.append(header.strip())
+        result = reverse_complement.reverse_complement(sequence,
+                                                       COMPLEMENTS_STR)
+        width = line_width or len(result) or 1
+        expected.extend(result[i:i + width]
+                        for i in range(0, len(result), width))
+    assert out.read_text().splitlines() == expected
+
+
+def test_reverse_complement_plain_file(tmp_path):
+    plain = tmp_path / "in.txt"
+    plain.write_text(DIRTY_DNA[2])
+    out = tmp_path / "out.txt"
+    reverse_complement.reverse_complement_file(plain, out, line_width=None)
+    assert out.read_text() == reverse_complement.reverse_complement(
+        DIRTY_DNA[2]) + "\n"
@@ -1,38 +1,144 @@
+import mmap
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
 IMPOSSIBLE = 'Mission impossible. No one can contribute.'
+CHUNK_SIZE = 1_000_000
 
+# Reduction state of a contiguous run of funds, all indexes 0-based and
+# absolute. prefix is (sum, end), suffix is (sum, start), best is
+# (sum, start, end) - each the best non-empty choice within the run.
+Summary = namedtuple('Summary', 'total prefix suffix best')
 
-def max_fund(village):
-    """Find a contiguous subarray with the largest sum."""
-    current, best = (0, 0, 0), (0, 0, 0)
-    in_block = False
-    for idx, fund in enumerate(village):
-        if fund > 0:  # need to start / continue
-            if not in_block:
-                current = (fund, idx, idx)
-                in_block = True
-            else:
-                current = (current[0] + fund, current[1], idx)
-        else:  # need to end
-            if in_block:
-                if current[0] > best[0]:
-                    best = current
-                current = (0, 0, 0)
-                in_block = False
-    if current != (0, 0, 0):
-        best = current
-    
-    if best[0] < 1:  # leave early, no win here
+
+def _summarize(funds, offset=0):
+    """Single pass Kadane over funds, returns a Summary or None if empty."""
+    total = 0
+    prefix = best = None
+    current, start = 0, offset
+    for idx, fund in enumerate(funds, offset):
+        total += fund
+        if prefix is None or total > prefix[0]:
+            prefix = (total, idx)
+        if current <= 0:
+            current, start = fund, idx
+        else:
+            current += fund
+        if best is None or current > best[0]:
+            best = (current, start, idx)
+    if prefix is None:
+        return None
+    # the best suffix is the running Kadane block that ends the run
+    suffix = (current, start)
+    return Summary(total, prefix, suffix, best)
+
+
+def _merge(left, right):
+    """Combine the summaries of two adjacent runs."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    prefix = left.prefix
+    if left.total + right.prefix[0] > prefix[0]:
+        prefix = (left.total + right.prefix[0], right.prefix[1])
+    suffix = right.suffix
+    if left.suffix[0] + right.total > suffix[0]:
+        suffix = (left.suffix[0] + right.total, left.suffix[1])
+    best = left.best
+    bridge = (left.suffix[0] + right.prefix[0],
+              left.suffix[1], right.prefix[1])
+    if bridge[0] > best[0]:
+        best = bridge
+    if right.best[0] > best[0]:
+        best = right.best
+    return Summary(left.total + right.total, prefix, suffix, best)
+
+
+def _result(summary):
+    if summary is None or summary.best[0] < 1:  # leave early, no win here
         print(IMPOSSIBLE)
         return (0, 0, 0)
+    fund, start, end = summary.best
+    return (fund, start + 1, end + 1)
+
+
+def max_fund(village):
+    """Find a contiguous subarray with the largest sum.
+
+    village can be any iterable of ints, it is consumed in a single pass.
+    Returns (sum, start, end) with 1-based start and end.
+    """
+    return _result(_summarize(village))
+
+
+def max_fund_stream(chunks):
+    """Like max_fund, but fed by an iterable of chunks of funds.
+
+    Only one chunk is held at a time, so the data never has to fit
+    in memory as a whole.
+    """
+    summary, offset = None, 0
+    for chunk in chunks:
+        summary = _merge(summary, _summarize(chunk, offset))
+        offset += len(chunk)
+    return _result(summary)
+
+
+def _summarize_in_pool(function, tasks, workers):
+    """Merge function(*task) over tasks run in a process pool, in order.
+
+    At most two tasks per worker are in flight, so the tasks (e.g. lazy
+    slices) are only created as the pool catches up.
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = None
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for task in tasks:
+            if len(pending) >= 2 * workers:
+                summary = _merge(summary, pending.popleft().result())
+            pending.append(executor.submit(function, *task))
+        while pending:
+            summary = _merge(summary, pending.popleft().result())
+    return summary
+
+
+def max_fund_chunked(village, chunk_size=CHUNK_SIZE, workers=None):
+    """Like max_fund, but sums chunks of village across a process pool.
+
+    village must support len() and slicing (list, array.array, ...).
+    """
+    tasks = ((village[start:start + chunk_size], start)
+             for start in range(0, len(village), chunk_size))
+    return _result(_summarize_in_pool(_summarize, tasks, workers))
+
+
+def _summarize_file(path, typecode, start, stop):
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        funds = memoryview(mapped).cast(typecode)
+        chunk = funds[start:stop]
+        try:
+            return _summarize(chunk, start)
+        finally:
+            chunk.release()
+            funds.release()
+
+
+def max_fund_file(path, typecode='i', chunk_size=CHUNK_SIZE, workers=None):
+    """Like max_fund_chunked, for a file of native ints (e.g. array.tofile).
 
-    # extend best - extend to start
-    for idx in range(0, best[1]):
-        new_sum = sum(village[idx:best[2] + 1])
-        if new_sum > best[0]:
-            best = (new_sum, idx, best[2])
-    for idx in range(best[2], len(village)):
-        new_sum = sum(village[best[1]:idx+1])
-        if new_sum > best[0]:
-            best = (new_sum, best[1], idx)
-
-    return (best[0], best[1] + 1, best[2] + 1)
+    Every worker memory-maps the file itself and only reads its own chunk.
+    """
+    if os.path.getsize(path) == 0:  # an empty file cannot be mapped
+        return _result(None)
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        funds = memoryview(mapped).cast(typecode)
+        size = len(funds)
+        funds.release()
+    tasks = ((path, typecode, start, min(start + chunk_size, size))
+             for start in range(0, size, chunk_size))
+    return _result(_summarize_in_pool(_summarize_file, tasks, workers))
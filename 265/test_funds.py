@@ -1,6 +1,9 @@
+from array import array
+
 import pytest
 
-from funds import max_fund
+from funds import (IMPOSSIBLE, max_fund, max_fund_chunked, max_fund_file,
+                   max_fund_stream)
 
 
 community = [3, 2, 6,  4, 7,  5, -8, -9, 3,  8,  4, -12, 3, -10, -15,
@@ -24,4 +27,59 @@ extreme = [-1, -2, -3, -4, -5, -1, -2, -3]
     (extreme, (0, 0, 0))
 ])
 def test_funds(data, expected):
-    assert max_fund(data) == expected
\ No newline at end of file
+    assert max_fund(data) == expected
+
+
+def _check(data, result):
+    fund, start, end = result
+    assert fund == max(sum(data[i:j + 1]) for i in range(len(data))
+                       for j in range(i, len(data)))
+    assert sum(data[start - 1:end]) == fund
+
+
+@pytest.mark.parametrize("data, expected", [
+    (community, (100, 31, 74)),
+    (poverty, (13, 6, 9)),
+    (some, (50,  9, 12)),
+    (extreme, (0, 0, 0))
+])
+def test_funds_generator(data, expected):
+    assert max_fund(fund for fund in data) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 13, 1000])
+@pytest.mark.parametrize("data", [community, poverty, some])
+def test_funds_stream(data, chunk_size):
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    _check(data, max_fund_stream(chunks))
+
+
+def test_funds_stream_impossible(capsys):
+    assert max_fund_stream([extreme[:3], extreme[3:]]) == (0, 0, 0)
+    assert max_fund_stream([]) == (0, 0, 0)
+    assert IMPOSSIBLE in capsys.readouterr().out
+
+
+def test_funds_chunked():
+    _check(community, max_fund_chunked(community, chunk_size=7, workers=2))
+
+
+def test_funds_file(tmp_path):
+    path = tmp_path / 'village.bin'
+    with open(path, 'wb') as f:
+        array('i', community).tofile(f)
+    _check(community, max_fund_file(path, chunk_size=9, workers=2))
+
+
+def test_funds_file_empty(tmp_path, capsys):
+    path = tmp_path / 'village.bin'
+    path.write_bytes(b'')
+    assert max_fund_file(path, workers=2) == (0, 0, 0)
+    assert max_fund_chunked([], workers=2) == (0, 0, 0)
+    assert IMPOSSIBLE in capsys.readouterr().out
+
+
+def test_funds_chunked_many_chunks():
+    village = community * 50
+    assert max_fund_chunked(village, chunk_size=3, workers=2) == \
+        max_fund(village)
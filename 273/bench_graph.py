@@ -0,0 +1,69 @@
+"""Benchmark shortest path queries on a synthetic road network.
+
+The network is a width x width grid of junctions with random road
+lengths, roughly the shape of a city street map.
+Run with: python bench_graph.py [width, default 300]
+"""
+import sys
+import tracemalloc
+from random import randint, sample, seed
+from time import perf_counter
+
+from graph import CSRGraph, RouteIndex, bidirectional_dijkstra, shortest_path
+
+
+def road_network(width):
+    graph = {(x, y): {} for x in range(width) for y in range(width)}
+    for x in range(width):
+        for y in range(width):
+            for neighbor in ((x + 1, y), (x, y + 1)):
+                if neighbor in graph:
+                    length = randint(1, 100)
+                    graph[(x, y)][neighbor] = length
+                    graph[neighbor][(x, y)] = length
+    return graph
+
+
+def timed(label, func, *args):
+    start = perf_counter()
+    result = func(*args)
+    print(f'{label:<40} {perf_counter() - start:8.3f}s')
+    return result
+
+
+def traced(build, *args):
+    tracemalloc.start()
+    result = build(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(width=300):
+    seed(273)
+    graph, dict_size = traced(road_network, width)
+    csr, csr_size = traced(CSRGraph.from_dict, graph)
+    edges = sum(len(neighbors) for neighbors in graph.values())
+    print(f'{len(graph):,} junctions, {edges:,} directed roads')
+    print(f'dict of dicts: {dict_size / 2**20:.1f} MiB,'
+          f' CSR arrays: {csr_size / 2**20:.1f} MiB')
+
+    starts = sample(list(graph), 3)
+    queries = [(start, end) for start in starts
+               for end in sample(list(graph), 100)]
+
+    timed('shortest_path, 3 queries', lambda: [
+        shortest_path(graph, start, end) for start, end in queries[:3]])
+    for label, network in (('dict', graph), ('CSR', csr)):
+        index = RouteIndex(network)
+        timed(f'RouteIndex ({label}), {len(queries)} queries', lambda: [
+            index.shortest_path(start, end) for start, end in queries])
+        timed(f'RouteIndex ({label}), same queries again', lambda: [
+            index.shortest_path(start, end) for start, end in queries])
+        timed(f'bidirectional ({label}), 30 queries', lambda: [
+            bidirectional_dijkstra(network, start, end)
+            for start, end in queries[::10]])
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
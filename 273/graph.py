@@ -1,12 +1,107 @@
+from array import array
+from collections import OrderedDict
 from math import inf
-from operator import itemgetter
 import heapq
 
 
-def calculate_parents(graph, start):
-    distances = {vertex: inf for vertex in graph}
-    parents = {vertex: None for vertex in graph}
-    distances[start] = 0
+class CSRGraph:
+    """Compressed sparse row graph, for graphs too big for dict of dicts.
+
+    Vertices are numbered 0..n-1; the edges leaving vertex i are
+    targets[offsets[i]:offsets[i + 1]] with the matching weights,
+    so every edge costs two 8 byte slots in flat arrays. Weights are
+    kept as ints ('q') unless one of them is not an int, then they are
+    all stored as floats ('d'), so distances keep the input's type.
+    """
+
+    def __init__(self, vertices, offsets, targets, weights):
+        self.vertices = vertices
+        self.index = {vertex: idx for idx, vertex in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, edges, vertices=None):
+        """Build from an iterable of (source, target, weight) edges."""
+        vertices = list(vertices or ())
+        index = {vertex: idx for idx, vertex in enumerate(vertices)}
+        sources, targets, weights = array('q'), array('q'), array('q')
+        for source, target, weight in edges:
+            for vertex in (source, target):
+                if vertex not in index:
+                    index[vertex] = len(vertices)
+                    vertices.append(vertex)
+            sources.append(index[source])
+            targets.append(index[target])
+            if weights.typecode == 'q' and not isinstance(weight, int):
+                weights = array('d', weights)
+            weights.append(weight)
+        return cls._from_arrays(vertices, sources, targets, weights)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """Build from the dict of dicts used by shortest_path."""
+        edges = ((source, target, weight)
+                 for source, neighbors in graph.items()
+                 for target, weight in neighbors.items())
+        return cls.from_edges(edges, vertices=graph)
+
+    @classmethod
+    def _from_arrays(cls, vertices, sources, targets, weights):
+        # counting sort of the edges by source vertex
+        offsets = array('q', bytes(8 * (len(vertices) + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for idx in range(len(vertices)):
+            offsets[idx + 1] += offsets[idx]
+        fill = array('q', offsets)
+        sorted_targets = array('q', bytes(8 * len(targets)))
+        sorted_weights = array(weights.typecode, bytes(8 * len(weights)))
+        for source, target, weight in zip(sources, targets, weights):
+            pos = fill[source]
+            sorted_targets[pos] = target
+            sorted_weights[pos] = weight
+            fill[source] = pos + 1
+        return cls(vertices, offsets, sorted_targets, sorted_weights)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def neighbors(self, vertex):
+        """(target, weight) pairs leaving the numbered vertex."""
+        start, end = self.offsets[vertex], self.offsets[vertex + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def reversed(self):
+        """The same graph with every edge pointing the other way."""
+        sources = array('q', bytes(8 * len(self.targets)))
+        for vertex in range(len(self.vertices)):
+            for pos in range(self.offsets[vertex], self.offsets[vertex + 1]):
+                sources[pos] = vertex
+        return self._from_arrays(self.vertices, self.targets, sources,
+                                 self.weights)
+
+
+def _adapt(graph):
+    """Return (neighbors, encode, decode) for a dict of dicts or CSRGraph."""
+    if isinstance(graph, CSRGraph):
+        return (graph.neighbors, graph.index.__getitem__,
+                graph.vertices.__getitem__)
+
+    def neighbors(vertex):
+        return graph[vertex].items()
+
+    def identity(vertex):
+        return vertex
+
+    return neighbors, identity, identity
+
+
+def _dijkstra(neighbors, start):
+    """Distances and parents of every vertex reachable from start."""
+    distances = {start: 0}
+    parents = {start: None}
     heap = [(0, start)]
 
     while len(heap) > 0:
@@ -14,13 +109,27 @@ def calculate_parents(graph, start):
         if current_distance > distances[current_vertex]:
             continue
 
-        for neighbor, weight in graph[current_vertex].items():
+        for neighbor, weight in neighbors(current_vertex):
             distance = current_distance + weight
-            if distance < distances[neighbor]:
+            if distance < distances.get(neighbor, inf):
                 distances[neighbor] = distance
                 parents[neighbor] = current_vertex
                 heapq.heappush(heap, (distance, neighbor))
-    return parents
+    return distances, parents
+
+
+def _walk(parents, end):
+    """Follow parents back from end, returns the path from the root."""
+    path = [end]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def calculate_parents(graph, start):
+    _, parents = _dijkstra(lambda vertex: graph[vertex].items(), start)
+    return {vertex: parents.get(vertex) for vertex in graph}
 
 
 def shortest_path(graph, start, end):
@@ -44,3 +153,81 @@ def shortest_path(graph, start, end):
         next = parents[current]
     shortest_path = list(reversed(path))
     return total_distance, shortest_path
+
+
+class RouteIndex:
+    """Answers repeated shortest_path queries from cached Dijkstra trees.
+
+    The distance/parent tree of each start city is computed once and kept
+    in an LRU cache of maxsize trees; after that every query sharing the
+    start city only walks the path back, O(path length).
+    """
+
+    def __init__(self, graph, maxsize=128):
+        self.graph = graph
+        self.maxsize = maxsize
+        self._neighbors, self._encode, self._decode = _adapt(graph)
+        self._trees = OrderedDict()
+
+    def tree(self, start):
+        """(distances, parents) of start, keyed by internal vertex."""
+        source = self._encode(start)
+        if source in self._trees:
+            self._trees.move_to_end(source)
+            return self._trees[source]
+        tree = self._trees[source] = _dijkstra(self._neighbors, source)
+        if len(self._trees) > self.maxsize:
+            self._trees.popitem(last=False)
+        return tree
+
+    def shortest_path(self, start, end):
+        """Same output as shortest_path, or None if end is unreachable."""
+        distances, parents = self.tree(start)
+        target = self._encode(end)
+        if target not in distances:
+            return None
+        path = [self._decode(vertex) for vertex in _walk(parents, target)]
+        return distances[target], path
+
+
+def bidirectional_dijkstra(graph, start, end, reverse=None):
+    """One-off shortest_path that searches from both ends at once.
+
+    graph is a dict of dicts or a CSRGraph. reverse is the graph with its
+    edges flipped and defaults to graph itself, fine for undirected roads.
+    Returns (distance, [path of cities]) or None if end is unreachable.
+    """
+    neighbors, encode, decode = _adapt(graph)
+    backward_neighbors = neighbors if reverse is None else _adapt(reverse)[0]
+    source, target = encode(start), encode(end)
+
+    searches = [
+        (neighbors, {source: 0}, {source: None}, [(0, source)]),
+        (backward_neighbors, {target: 0}, {target: None}, [(0, target)]),
+    ]
+    best, meeting = (0, source) if source == target else (inf, None)
+    side = 0
+    while searches[0][3] and searches[1][3]:
+        if searches[0][3][0][0] + searches[1][3][0][0] >= best:
+            break
+        step_neighbors, distances, parents, heap = searches[side]
+        other_distances = searches[1 - side][1]
+        current_distance, current_vertex = heapq.heappop(heap)
+        if current_distance <= distances[current_vertex]:
+            for neighbor, weight in step_neighbors(current_vertex):
+                distance = current_distance + weight
+                if distance < distances.get(neighbor, inf):
+                    distances[neighbor] = distance
+                    parents[neighbor] = current_vertex
+                    heapq.heappush(heap, (distance, neighbor))
+                if neighbor in other_distances:
+                    total = distances[neighbor] + other_distances[neighbor]
+                    if total < best:
+                        best, meeting = total, neighbor
+        side = 1 - side
+
+    if meeting is None:
+        return None
+    path = _walk(searches[0][2], meeting)
+    path.extend(reversed(_walk(searches[1][2], meeting)[:-1]))
+    return best, [decode(vertex) for vertex in path]
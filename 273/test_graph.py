@@ -1,4 +1,7 @@
-from graph import shortest_path
+import pytest
+
+from graph import (CSRGraph, RouteIndex, bidirectional_dijkstra,
+                   shortest_path)
 
 simple = {
           'a': {'b': 2, 'c': 4, 'e': 1},
@@ -27,4 +30,67 @@ def test_graph_simple():
 def test_graph_major():
     actual = shortest_path(major, 'a', 'b')
     expected = (20, ['a', 'y', 'w', 'b'])
-    assert actual == expected
\ No newline at end of file
+    assert actual == expected
+
+
+def test_route_index():
+    index = RouteIndex(major, maxsize=2)
+    assert index.shortest_path('a', 'b') == (20, ['a', 'y', 'w', 'b'])
+    assert index.shortest_path('a', 'z') == (20, ['a', 'y', 'z'])
+    assert index.shortest_path('a', 'a') == (0, ['a'])
+    index.shortest_path('b', 'a')
+    index.shortest_path('z', 'a')
+    assert len(index._trees) == 2
+    assert index.shortest_path('b', 'a') == (20, ['b', 'w', 'y', 'a'])
+
+
+def test_route_index_unreachable():
+    graph = {'a': {'b': 1}, 'b': {'a': 1}, 'c': {}}
+    assert RouteIndex(graph).shortest_path('a', 'c') is None
+
+
+def test_route_index_csr():
+    index = RouteIndex(CSRGraph.from_dict(simple))
+    assert index.shortest_path('a', 'd') == (3, ['a', 'e', 'd'])
+
+
+@pytest.mark.parametrize("graph", [simple, major])
+def test_bidirectional_dijkstra(graph):
+    csr = CSRGraph.from_dict(graph)
+    for start in graph:
+        for end in graph:
+            expected = shortest_path(graph, start, end)
+            assert bidirectional_dijkstra(graph, start, end)[0] == expected[0]
+            distance, path = bidirectional_dijkstra(csr, start, end)
+            assert distance == expected[0]
+            assert path[0] == start and path[-1] == end
+            assert sum(graph[a][b] for a, b in zip(path, path[1:])) == distance
+
+
+def test_bidirectional_dijkstra_directed():
+    graph = {'a': {'b': 1, 'c': 5}, 'b': {'c': 1}, 'c': {}}
+    csr = CSRGraph.from_dict(graph)
+    assert bidirectional_dijkstra(csr, 'a', 'c', csr.reversed()) == \
+        (2, ['a', 'b', 'c'])
+    assert bidirectional_dijkstra(csr, 'c', 'a', csr.reversed()) is None
+
+
+def test_csr_graph():
+    csr = CSRGraph.from_edges([('x', 'y', 2), ('y', 'z', 3), ('x', 'z', 7)])
+    assert len(csr) == 3
+    assert sorted(csr.neighbors(csr.index['x'])) == [(1, 2), (2, 7)]
+    assert list(csr.reversed().neighbors(csr.index['z'])) == [(0, 7),
+                                                            (1, 3)]
+
+
+def test_csr_graph_keeps_weight_type():
+    csr = CSRGraph.from_dict(simple)
+    distance, _ = RouteIndex(csr).shortest_path('a', 'd')
+    assert distance == 3 and isinstance(distance, int)
+    assert isinstance(bidirectional_dijkstra(csr, 'a', 'd')[0], int)
+    assert isinstance(csr.reversed().weights[0], int)
+
+    csr = CSRGraph.from_edges([('x', 'y', 2), ('y', 'x', 2),
+                               ('y', 'z', 0.5), ('z', 'y', 0.5)])
+    assert csr.weights.typecode == 'd'
+    assert bidirectional_dijkstra(csr, 'x', 'z') == (2.5, ['x', 'y', 'z'])
@@ -1,17 +1,143 @@
-from typing import List
+from array import array
+from math import gcd
+from typing import Iterator, List, Optional, Sequence
 
 
 def pascal(N: int) -> List[int]:
-    if N == 0:
+    return pascal_row(N)
+
+
+def _new_row(mod: Optional[int]):
+    """An empty row: a list, or an array('q') when values mod fit in it."""
+    if mod is None:
         return []
-    if N == 1:
-        return [1]
+    if mod < 1:
+        raise ValueError('mod must be a positive integer')
+    return array('q') if mod <= 2 ** 63 else []
+
+
+def pascal_rows(N: Optional[int] = None,
+                mod: Optional[int] = None) -> Iterator[Sequence[int]]:
+    """Yield the first N rows of the triangle, or all of them if N is None.
+
+    The same row object is updated in place and yielded again, copy it
+    if you need to keep it around. With mod the row holds the values
+    modulo mod, in an array('q') whenever mod fits in one.
+    """
+    row = _new_row(mod)
+    count = 0
+    while N is None or count < N:
+        row.append(1 if mod is None else 1 % mod)
+        for i in range(len(row) - 2, 0, -1):
+            if mod is None:
+                row[i] += row[i - 1]
+            else:
+                row[i] = (row[i] + row[i - 1]) % mod
+        count += 1
+        yield row
+
+
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def _is_prime(number: int) -> bool:
+    """Miller-Rabin, deterministic for every number below 3.3 * 10**24."""
+    if number < 2:
+        return False
+    for prime in _SMALL_PRIMES:
+        if number % prime == 0:
+            return number == prime
+    odd, twos = number - 1, 0
+    while odd % 2 == 0:
+        odd //= 2
+        twos += 1
+    for base in _SMALL_PRIMES:
+        x = pow(base, odd, number)
+        if x in (1, number - 1):
+            continue
+        for _ in range(twos - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+    return True
 
-    l = [0]
-    l.extend(pascal(N-1))
-    l.append(0)
 
-    result = []
-    for i in range(len(l)-1):
-        result.append(l[i] + l[i+1])
-    return result
\ No newline at end of file
+def _find_factor(number: int) -> int:
+    """A nontrivial factor of an odd composite number (Pollard's rho)."""
+    for c in range(1, number):
+        x = y = 2
+        factor = 1
+        while factor == 1:
+            x = (x * x + c) % number
+            y = (y * y + c) % number
+            y = (y * y + c) % number
+            factor = gcd(abs(x - y), number)
+        if factor != number:
+            return factor
+    raise ValueError(f'{number} has no factor to find')
+
+
+def _prime_factors(number: int) -> List[int]:
+    """The distinct prime factors of number, smallest first."""
+    factors = set()
+    for prime in _SMALL_PRIMES:
+        while number % prime == 0:
+            factors.add(prime)
+            number //= prime
+    pending = [number] if number > 1 else []
+    while pending:
+        number = pending.pop()
+        if _is_prime(number):
+            factors.add(number)
+        else:
+            factor = _find_factor(number)
+            pending += [factor, number // factor]
+    return sorted(factors)
+
+
+def _strip(number: int, prime: int):
+    """Split number into (prime exponent, remaining factor)."""
+    exponent = 0
+    while number % prime == 0:
+        number //= prime
+        exponent += 1
+    return exponent, number
+
+
+def pascal_row(N: int, mod: Optional[int] = None) -> Sequence[int]:
+    """Row N of the triangle (the one with N entries), built directly.
+
+    Uses the multiplicative formula C(n, k+1) = C(n, k) * (n-k) / (k+1)
+    instead of building the rows before it. With mod, the powers of each
+    prime factor of mod are tracked apart from the rest, which is
+    invertible mod mod, so the division stays exact for any modulus.
+    """
+    row = _new_row(mod)
+    if N == 0:
+        return row
+    n = N - 1
+    if mod is None:
+        row = [1] * N
+        for k in range(n // 2):
+            row[k + 1] = row[n - k - 1] = row[k] * (n - k) // (k + 1)
+        return row
+
+    row.extend([1 % mod] * N)
+    primes = _prime_factors(mod)
+    exponents = dict.fromkeys(primes, 0)
+    unit = 1
+    for k in range(n // 2):
+        up, down = n - k, k + 1
+        for prime in primes:
+            up_exponent, up = _strip(up, prime)
+            down_exponent, down = _strip(down, prime)
+            exponents[prime] += up_exponent - down_exponent
+        unit = unit * up * pow(down, -1, mod) % mod
+        value = unit
+        for prime, exponent in exponents.items():
+            if exponent:
+                value = value * pow(prime, exponent, mod) % mod
+        row[k + 1] = row[n - k - 1] = value
+    return row
@@ -1,6 +1,6 @@
 import pytest
 
-from pascal import pascal
+from pascal import pascal, pascal_row, pascal_rows
 
 
 @pytest.mark.parametrize("arg, expected", [
@@ -13,4 +13,66 @@ from pascal import pascal
     (6, [1, 5, 10, 10, 5, 1]),
 ])
 def test_pascal(arg, expected):
-    assert pascal(arg) == expected
\ No newline at end of file
+    assert pascal(arg) == expected
+
+
+def test_pascal_deep():
+    row = pascal(3000)
+    assert len(row) == 3000
+    assert row[1] == 2999
+    assert row[2] == 2999 * 2998 // 2
+    assert row == row[::-1]
+
+
+def test_pascal_rows():
+    rows = [list(row) for row in pascal_rows(12)]
+    assert rows == [pascal(n) for n in range(1, 13)]
+
+
+def test_pascal_rows_in_place():
+    rows = pascal_rows()
+    first = next(rows)
+    assert next(rows) is first
+    assert next(rows) == [1, 2, 1]
+
+
+@pytest.mark.parametrize("mod", [2, 3, 7, 13, 1_000_000_007, 1, 4, 12, 100])
+def test_pascal_row_mod(mod):
+    for N in (0, 1, 2, 5, 14, 50, 201):
+        expected = [value % mod for value in pascal(N)]
+        assert list(pascal_row(N, mod=mod)) == expected
+        *_, last = [list(row) for row in pascal_rows(N, mod=mod)] or [[]]
+        assert last == expected
+
+
+def test_pascal_row_mod_big():
+    mod = 1_000_000_007
+    row = pascal_row(200_000, mod=mod)
+    assert len(row) == 200_000
+    assert row[1] == 199_999
+    assert row[3] == 199_999 * 199_998 * 199_997 // 6 % mod
+
+
+def test_pascal_row_mod_composite_big():
+    mod = 10 ** 9
+    row = pascal_row(20_000, mod=mod)
+    assert list(row) == [value % mod for value in pascal(20_000)]
+    assert len(pascal_row(200_000, mod=mod)) == 200_000
+
+
+@pytest.mark.parametrize("mod", [2 ** 61 - 1, 2 ** 63, 2 ** 64 + 1,
+                                 (2 ** 31 - 1) * (2 ** 61 - 1)])
+def test_pascal_row_mod_large(mod):
+    for N in (10, 300):
+        expected = [value % mod for value in pascal(N)]
+        assert list(pascal_row(N, mod=mod)) == expected
+        *_, last = pascal_rows(N, mod=mod)
+        assert list(last) == expected
+
+
+@pytest.mark.parametrize("mod", [0, -7])
+def test_pascal_row_bad_mod(mod):
+    with pytest.raises(ValueError):
+        pascal_row(5, mod=mod)
+    with pytest.raises(ValueError):
+        next(pascal_rows(5, mod=mod))
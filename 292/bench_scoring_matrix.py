@@ -0,0 +1,39 @@
+"""Score one reference against 100k equal-length queries.
+
+Run with: python bench_scoring_matrix.py [queries, default 100000]
+"""
+import random
+import sys
+from time import perf_counter
+
+from scoring_matrix import BLOSUM62, _load_matrix, closest_match
+
+AMINO_ACIDS = 'ARNDCQEGHILKMFPSTWYV'
+
+
+def loop_score(reference, query, score_matrix):
+    """The original per residue Python loop (matrix loaded once)"""
+    return sum(score_matrix[a.upper()][b.upper()]
+               for a, b in zip(reference, query))
+
+
+def main(count=100_000, length=110):
+    rnd = random.Random(292)
+    reference = ''.join(rnd.choices(AMINO_ACIDS, k=length))
+    queries = [''.join(rnd.choices(AMINO_ACIDS, k=length))
+               for _ in range(count)]
+    score_matrix = _load_matrix(BLOSUM62)
+
+    start = perf_counter()
+    for query in queries[:count // 10]:
+        loop_score(reference, query, score_matrix)
+    loop_time = (perf_counter() - start) * 10
+    print(f'Python loop (estimated from 10%): {loop_time:8.3f}s')
+
+    start = perf_counter()
+    closest_match(reference, queries)
+    print(f'closest_match, vectorized:        {perf_counter() - start:8.3f}s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
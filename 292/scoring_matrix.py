@@ -1,7 +1,11 @@
 import csv
+import os
 from collections import defaultdict
-from operator import itemgetter
-from typing import Union, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Union, List, Sequence
+
+import numpy as np
 
 # Grabbed matrix from from
 # https://www.ncbi.nlm.nih.gov/Class/FieldGuide/BLOSUM62.txt
@@ -59,38 +63,188 @@ def _load_matrix(matrix_str: str) -> dict:
     return matrix
 
 
-def matrix_score(sequence1: str, sequence2: str, matrix_str: str = BLOSUM62) -> int:
+INVALID = 255
+# BLAST defaults for BLOSUM62: a gap of length k costs open + k * extend
+GAP_OPEN = 11
+GAP_EXTEND = 1
+# stands in for minus infinity in the integer DP arrays
+NEG = -(1 << 40)
+
+
+class CompiledMatrix:
+    """
+    A scoring matrix as a 2D integer array plus a byte -> row/column
+    lookup table (upper and lower case), so residues of many sequences
+    can be scored with a few vectorized numpy operations
+    """
+
+    def __init__(self, matrix: dict):
+        self.residues = ''.join(matrix)
+        index = {residue: idx for idx, residue in enumerate(self.residues)}
+        self.scores = np.zeros((len(index), len(index)), dtype=np.int64)
+        for amino1, row in matrix.items():
+            for amino2, score in row.items():
+                self.scores[index[amino1], index[amino2]] = score
+        self.lookup = np.full(256, INVALID, dtype=np.uint8)
+        for residue, idx in index.items():
+            self.lookup[ord(residue.upper())] = idx
+            self.lookup[ord(residue.lower())] = idx
+
+    def encode(self, sequences: Sequence[str], length: int) -> np.ndarray:
+        """Residue indexes of sequences (cut to length) as a 2D array"""
+        data = ''.join(sequence[:length] for sequence in sequences)
+        codes = np.frombuffer(data.encode('ascii', 'replace'), dtype=np.uint8)
+        return self.lookup[codes].reshape(len(sequences), length)
+
+    def indexes(self, sequence: str) -> np.ndarray:
+        """Residue indexes of one sequence, raises for unknown residues"""
+        idx = self.encode([sequence], len(sequence))[0]
+        if (idx == INVALID).any():
+            residue = sequence[int(np.argmax(idx == INVALID))]
+            raise AminoAcidNotFoundError(
+                f'Scoring matrix does not support scoring for: \'{residue}\'')
+        return idx
+
+    def score_many(self, reference: str, queries: Sequence[str]) -> np.ndarray:
+        """
+        Scores of reference against every query (position by position, up
+        to the shorter sequence), computed per group of equal length
+        """
+        result = np.zeros(len(queries), dtype=np.int64)
+        by_length = defaultdict(list)
+        for position, query in enumerate(queries):
+            by_length[min(len(reference), len(query))].append(position)
+        for length, positions in by_length.items():
+            group = [queries[position] for position in positions]
+            reference_idx = self.encode([reference], length)[0]
+            query_idx = self.encode(group, length)
+            invalid = (query_idx == INVALID) | (reference_idx == INVALID)
+            if invalid.any():
+                row, column = np.argwhere(invalid)[0]
+                raise AminoAcidNotFoundError(
+                    f'Scoring matrix does not support scoring for: '
+                    f'(\'{reference[column]}\', \'{group[row][column]}\')')
+            result[positions] = self.scores[reference_idx, query_idx].sum(axis=1)
+        return result
+
+
+@lru_cache(maxsize=16)
+def compile_matrix(matrix_str: str = BLOSUM62) -> CompiledMatrix:
+    return CompiledMatrix(_load_matrix(matrix_str))
+
+
+def matrix_score(sequence1: str, sequence2: str, matrix_str: str = BLOSUM62,
+                 verbose: bool = False) -> int:
     """
     Receives two proteins sequences and a matrix table
     Returns the score of two proteins according to the supplied matrix table
+    With verbose the score of every residue pair is printed
     """
-    score_matrix = _load_matrix(matrix_str)
-    score = 0
-    for amino1, amino2 in zip(sequence1, sequence2):
-        try:
-            current_score = score_matrix[amino1.upper()][amino2.upper()]
-            score += current_score
-            print(f'{amino1} <-> {amino2}: {current_score}')
-        except KeyError:
-            raise AminoAcidNotFoundError(f'Scoring matrix does not support scoring for: (\'{amino1}\', \'{amino2}\')')
+    matrix = compile_matrix(matrix_str)
+    score = int(matrix.score_many(sequence1, [sequence2])[0])
+    if verbose:
+        for amino1, amino2 in zip(sequence1, sequence2):
+            row, column = matrix.lookup[[ord(amino1), ord(amino2)]]
+            print(f'{amino1} <-> {amino2}: {matrix.scores[row, column]}')
     return score
 
 
+def align_score(sequence1: str, sequence2: str, matrix_str: str = BLOSUM62,
+                mode: str = 'global', gap_open: int = GAP_OPEN,
+                gap_extend: int = GAP_EXTEND) -> int:
+    """
+    Receives two protein sequences (any lengths) and a matrix table
+    Returns the optimal alignment score with affine gap penalties, a gap
+    of length k costing gap_open + k * gap_extend:
+    mode 'global' (Needleman-Wunsch) aligns the full sequences,
+    mode 'local' (Smith-Waterman) the best scoring pair of substrings.
+
+    Gotoh's three-state DP is filled one anti-diagonal at a time: all
+    cells with i + j == d only depend on diagonals d-1 and d-2, so each
+    diagonal is a handful of numpy operations and memory stays linear.
+    """
+    if mode not in ('global', 'local'):
+        raise ValueError(f'mode must be global or local, not {mode!r}')
+    local = mode == 'local'
+    matrix = compile_matrix(matrix_str)
+    a, b = matrix.indexes(sequence1), matrix.indexes(sequence2)
+    n, m = len(a), len(b)
+    gap_first = gap_open + gap_extend
+
+    # diagonals indexed by i (row), j = d - i; two generations kept
+    empty = np.full(n + 1, NEG, dtype=np.int64)
+    match_prev2, match_prev = empty.copy(), empty.copy()
+    xgap_prev2, xgap_prev = empty.copy(), empty.copy()
+    ygap_prev2, ygap_prev = empty.copy(), empty.copy()
+    match_prev[0] = 0  # diagonal 0 only holds cell (0, 0)
+    best = 0
+
+    for d in range(1, n + m + 1):
+        lo, hi = max(0, d - m), min(n, d)
+        match, xgap, ygap = empty.copy(), empty.copy(), empty.copy()
+
+        # M[i, j]: residues a[i-1] and b[j-1] aligned, needs i, j >= 1
+        start, stop = max(1, lo), min(hi, d - 1)
+        if start <= stop:
+            rows = np.arange(start, stop + 1)
+            previous = np.maximum(np.maximum(match_prev2[start - 1:stop],
+                                             xgap_prev2[start - 1:stop]),
+                                  ygap_prev2[start - 1:stop])
+            if local:
+                previous = np.maximum(previous, 0)
+            match[start:stop + 1] = (matrix.scores[a[rows - 1], b[d - rows - 1]]
+                                     + previous)
+            if local:
+                best = max(best, int(match[start:stop + 1].max()))
+
+        # X[i, j]: a[i-1] against a gap, comes from (i-1, j) on d-1
+        start, stop = max(1, lo), hi
+        if start <= stop:
+            xgap[start:stop + 1] = np.maximum(
+                np.maximum(match_prev[start - 1:stop],
+                           ygap_prev[start - 1:stop]) - gap_first,
+                xgap_prev[start - 1:stop] - gap_extend)
+
+        # Y[i, j]: b[j-1] against a gap, comes from (i, j-1) on d-1
+        start, stop = lo, min(hi, d - 1)
+        if start <= stop:
+            ygap[start:stop + 1] = np.maximum(
+                np.maximum(match_prev[start:stop + 1],
+                           xgap_prev[start:stop + 1]) - gap_first,
+                ygap_prev[start:stop + 1] - gap_extend)
+
+        match_prev2, match_prev = match_prev, match
+        xgap_prev2, xgap_prev = xgap_prev, xgap
+        ygap_prev2, ygap_prev = ygap_prev, ygap
+
+    if local:
+        return best
+    return int(max(match_prev[n], xgap_prev[n], ygap_prev[n]))
+
+
 def closest_match(
-    reference_sequence: str, query_sequences: List[str], matrix_str: str = BLOSUM62
+    reference_sequence: str, query_sequences: List[str], matrix_str: str = BLOSUM62,
+    alignment: str = None, workers: int = None
 ) -> Union[str, List, None]:
     """
     Receives a reference sequence, a list of query sequences and a matrix table
     Returns the closest matching sequence(s) or None
+    With alignment ('global' or 'local') queries are ranked by their
+    align_score instead, computed across a pool of workers processes
     """
-    scores = [
-        (reference_sequence, query_sequence, matrix_score(reference_sequence, query_sequence, matrix_str))
-        for query_sequence in query_sequences
-    ]
-    if len(scores) == 0:
+    if len(query_sequences) == 0:
         return None
-    max_score = max(scores, key=itemgetter(2))
-    max_sequences = [query_sequence for _, query_sequence, score in scores if score == max_score[2]]
+    if alignment is None:
+        scores = compile_matrix(matrix_str).score_many(reference_sequence, query_sequences)
+    else:
+        score = partial(align_score, reference_sequence, matrix_str=matrix_str, mode=alignment)
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(query_sequences) // (4 * workers))
+        with ProcessPoolExecutor(workers) as executor:
+            scores = np.fromiter(executor.map(score, query_sequences, chunksize=chunksize),
+                                 dtype=np.int64, count=len(query_sequences))
+    max_score = scores.max()
+    max_sequences = [query_sequences[idx] for idx in np.flatnonzero(scores == max_score)]
     if len(max_sequences) == 1:
         return max_sequences[0]
     return max_sequences 
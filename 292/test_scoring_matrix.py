@@ -153,4 +153,128 @@ def test_best_hit_single_invalid_sequence():
     assert (
         repr(kerr.value)
         == "AminoAcidNotFoundError(\"Scoring matrix does not support scoring for: ('G', 'O')\")"
-    )
\ No newline at end of file
+    )
+
+
+def test_matrix_score_verbose(capsys):
+    """
+    Per residue printing is opt-in
+    """
+    assert scoring_matrix.matrix_score("MAW", "mgW") == 16
+    assert capsys.readouterr().out == ""
+    assert scoring_matrix.matrix_score("MAW", "mgW", verbose=True) == 16
+    assert capsys.readouterr().out.splitlines() == [
+        "M <-> m: 5", "A <-> g: 0", "W <-> W: 11"]
+
+
+@pytest.mark.parametrize("matrix", [scoring_matrix.BLOSUM62, PAM70])
+def test_score_many(matrix):
+    """
+    Vectorized scoring matches scoring the queries one by one,
+    also for queries of different lengths
+    """
+    queries = INSULIN_VARIANTS_NO_TIE + [HUMAN_INSULIN[:50], "", "MALW" * 40]
+    compiled = scoring_matrix.compile_matrix(matrix)
+    assert scoring_matrix.compile_matrix(matrix) is compiled
+    expected = [
+        sum(scoring_matrix._load_matrix(matrix)[a.upper()][b.upper()]
+            for a, b in zip(HUMAN_INSULIN, query))
+        for query in queries
+    ]
+    assert list(compiled.score_many(HUMAN_INSULIN, queries)) == expected
+
+
+def test_score_many_error():
+    """
+    Invalid residues in any query raise the same error
+    """
+    with pytest.raises(scoring_matrix.AminoAcidNotFoundError) as kerr:
+        scoring_matrix.compile_matrix(PAM70).score_many(
+            "MAAAAG", ["MAAAAG", "MAAAAO", "MAAAAÜ"])
+    assert "('G', 'O')" in str(kerr.value)
+
+
+def gotoh(seq1, seq2, matrix_str, local, gap_open=11, gap_extend=1):
+    """
+    Plain cell by cell reference implementation of align_score
+    """
+    scores = scoring_matrix._load_matrix(matrix_str)
+    neg = float("-inf")
+    n, m = len(seq1), len(seq2)
+    match = [[neg] * (m + 1) for _ in range(n + 1)]
+    xgap = [[neg] * (m + 1) for _ in range(n + 1)]
+    ygap = [[neg] * (m + 1) for _ in range(n + 1)]
+    match[0][0] = 0
+    best = 0
+    for i in range(n + 1):
+        for j in range(m + 1):
+            if i and j:
+                previous = max(match[i - 1][j - 1], xgap[i - 1][j - 1],
+                               ygap[i - 1][j - 1])
+                if local:
+                    previous = max(previous, 0)
+                match[i][j] = scores[seq1[i - 1].upper()][seq2[j - 1].upper()] + previous
+                best = max(best, match[i][j])
+            if i:
+                xgap[i][j] = max(match[i - 1][j] - gap_open - gap_extend,
+                                 ygap[i - 1][j] - gap_open - gap_extend,
+                                 xgap[i - 1][j] - gap_extend)
+            if j:
+                ygap[i][j] = max(match[i][j - 1] - gap_open - gap_extend,
+                                 xgap[i][j - 1] - gap_open - gap_extend,
+                                 ygap[i][j - 1] - gap_extend)
+    if local:
+        return best
+    return max(match[n][m], xgap[n][m], ygap[n][m])
+
+
+@pytest.mark.parametrize("mode", ["global", "local"])
+@pytest.mark.parametrize("matrix", [scoring_matrix.BLOSUM62, PAM70])
+def test_align_score(mode, matrix):
+    """
+    The anti-diagonal DP matches the cell by cell reference
+    """
+    import random
+    rnd = random.Random(292)
+    pairs = [("", ""), ("", "MAW"), ("MAW", ""), ("W", "w")] + [
+        ("".join(rnd.choices("ARNDCQEGHILKMFPSTWYV", k=rnd.randint(1, 25))),
+         "".join(rnd.choices("ARNDCQEGHILKMFPSTWYV", k=rnd.randint(1, 25))))
+        for _ in range(30)
+    ]
+    for seq1, seq2 in pairs:
+        for gap_open, gap_extend in [(11, 1), (2, 1), (0, 3)]:
+            assert scoring_matrix.align_score(
+                seq1, seq2, matrix, mode, gap_open, gap_extend
+            ) == gotoh(seq1, seq2, matrix, mode == "local", gap_open, gap_extend)
+
+
+def test_align_score_gapped():
+    """
+    Alignment handles sequences of different lengths
+    """
+    query = HUMAN_INSULIN[:40] + HUMAN_INSULIN[45:]
+    ungapped = scoring_matrix.matrix_score(HUMAN_INSULIN, query)
+    aligned = scoring_matrix.align_score(HUMAN_INSULIN, query)
+    assert aligned == scoring_matrix.matrix_score(HUMAN_INSULIN, HUMAN_INSULIN) - \
+        sum(scoring_matrix._load_matrix(scoring_matrix.BLOSUM62)[a.upper()][a.upper()]
+            for a in HUMAN_INSULIN[40:45]) - 11 - 5
+    assert aligned > ungapped
+
+
+def test_align_score_errors():
+    with pytest.raises(ValueError):
+        scoring_matrix.align_score("MAW", "MAW", mode="semi")
+    with pytest.raises(scoring_matrix.AminoAcidNotFoundError):
+        scoring_matrix.align_score("MAW", "MAO")
+
+
+def test_best_hit_alignment():
+    """
+    closest_match can rank queries of different lengths by alignment
+    """
+    queries = [HUMAN_INSULIN[:40] + HUMAN_INSULIN[45:], HUMAN_INSULIN[::2],
+               "MALW" * 10]
+    assert scoring_matrix.closest_match(
+        HUMAN_INSULIN, queries, alignment="global", workers=2) == queries[0]
+    assert scoring_matrix.closest_match(
+        HUMAN_INSULIN, queries, alignment="local", workers=1) == queries[0]
@@ -210,4 +210,156 @@ def test_gzipped_fastas(fasta_dir, tmp_path):
         assert (
             f.readlines()[0].strip().upper()
             == ">gene [locus_tags=AA11,BB22,CC33]".upper()
-        )
\ No newline at end of file
+        )
+
+
+@pytest.fixture
+def local_fastas(tmp_path):
+    """
+    The FASTA files of fasta_dir that do not need a download
+    """
+    simple_fasta = [
+        (">gene [locus_tag=AA11]", "AAAAAA"),
+        (">gene [locus_tag=BB22]", "AAAAAA"),
+        (">gene [locus_tag=CC33]", "AAAAAA"),
+        (">gene [locus_tag=DD44]", "GAAAAC"),
+    ]
+    variations = {
+        "simple_test.fasta": simple_fasta,
+        "simple_multi_fasta.fasta": [(">gene [locus_tag=AA11]", "AAA\nAAA")],
+        "gene_case_variation.fasta": [(">gEnE [locus_tag=AA11]", "AAAAAA")],
+        "seq_case_variation.fasta": [(">gene [locus_tag=AA11]", "AaAaAa")],
+        "first_header_missing.fasta": [("gene [locus_tag=AA11]", "AAAAAA")],
+        "two_gene_names.fasta": [(">gene2 [locus_tag=AA11]", "AAAAAA")],
+    }
+    for filename, first in variations.items():
+        write_test_file(str(tmp_path / filename), first + simple_fasta[len(first):])
+    write_test_file(str(tmp_path / "simple_test.fasta.gz"), simple_fasta, zip=True)
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "filename, first_line",
+    [
+        ("simple_test.fasta", ">gene [locus_tags=AA11,BB22,CC33]"),
+        ("simple_multi_fasta.fasta", ">gene [locus_tags=AA11,BB22,CC33]"),
+        ("gene_case_variation.fasta", ">gene [locus_tags=AA11,BB22,CC33]"),
+        ("seq_case_variation.fasta", ">gene [locus_tags=AA11,BB22,CC33]"),
+        ("first_header_missing.fasta", ">gene [locus_tags=BB22,CC33]"),
+        ("simple_test.fasta.gz", ">gene [locus_tags=AA11,BB22,CC33]"),
+    ],
+)
+def test_streaming(local_fastas, tmp_path, filename, first_line):
+    """
+    Test the streaming mode on the same inputs
+    """
+    output_filename = tmp_path / "output.fasta"
+    unique_genes.convert_to_unique_genes(
+        str(local_fastas / filename), str(output_filename), streaming=True
+    )
+    with open(output_filename, "r") as f:
+        all_lines = f.readlines()
+    assert sum(1 for line in all_lines if line[0] == ">") == 2
+    assert all_lines[0].strip().upper() == first_line.upper()
+    assert all_lines[2].strip() == ">gene [locus_tags=DD44]"
+
+
+def test_streaming_matches_records(local_fastas, tmp_path):
+    """
+    Streaming writes the same FASTA as convert_to_unique_genes
+    """
+    records = [
+        (f">narI [locus_tag=T{idx}]", seq)
+        for idx, seq in enumerate(["ACGT" * 40, "acgt" * 40, "TTT", "ACGT" * 40, "TTT", "G"])
+    ]
+    input_filename = str(tmp_path / "many.fasta")
+    write_test_file(input_filename, records)
+    unique_genes.convert_to_unique_genes(input_filename, str(tmp_path / "list.fasta"))
+    unique_genes.convert_to_unique_genes(
+        input_filename, str(tmp_path / "stream.fasta.gz"), streaming=True
+    )
+    with open(tmp_path / "list.fasta") as expected, gzip.open(
+        tmp_path / "stream.fasta.gz", "rt"
+    ) as streamed:
+        assert streamed.read() == expected.read()
+
+
+@pytest.mark.parametrize("filename, temp_files", [
+    ("simple_test.fasta", 1),
+    ("simple_test.fasta.gz", 2),
+])
+def test_streaming_temp_files(local_fastas, tmp_path, monkeypatch, filename, temp_files):
+    """
+    Only gzipped input needs a spool next to the locus tags file
+    """
+    opened = []
+    real_temporary_file = unique_genes.tempfile.TemporaryFile
+
+    def temporary_file(*args, **kwargs):
+        opened.append(args)
+        return real_temporary_file(*args, **kwargs)
+
+    monkeypatch.setattr(unique_genes.tempfile, "TemporaryFile", temporary_file)
+    unique_genes.convert_to_unique_genes(
+        str(local_fastas / filename), str(tmp_path / "output.fasta"), streaming=True
+    )
+    assert len(opened) == temp_files
+
+
+def test_streaming_ambigious_gene_name(local_fastas, tmp_path):
+    with pytest.raises(NameError) as excinfo:
+        unique_genes.convert_to_unique_genes(
+            str(local_fastas / "two_gene_names.fasta"),
+            str(tmp_path / "output.fasta"),
+            streaming=True,
+        )
+    assert "Gene names differ between entries: 'gene2' vs. 'gene'" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("run_size", [1, 3, 1000])
+def test_external_sort(local_fastas, tmp_path, run_size, monkeypatch):
+    """
+    The disk backed mode writes the same FASTA with any memory budget
+    """
+    monkeypatch.setattr(unique_genes, "MERGE_FANIN", 4)
+    records = [
+        (f">narI [locus_tag=T{idx}]", "ACGT" * (idx % 7 + 1) if idx % 3 else "TTTAAA")
+        for idx in range(40)
+    ]
+    input_filename = str(tmp_path / "many.fasta")
+    write_test_file(input_filename, records)
+    unique_genes.convert_to_unique_genes(input_filename, str(tmp_path / "list.fasta"))
+    stats = unique_genes.convert_to_unique_genes(
+        input_filename, str(tmp_path / "external.fasta"), run_size=run_size
+    )
+    with open(tmp_path / "list.fasta") as expected, open(
+        tmp_path / "external.fasta"
+    ) as external:
+        assert external.read() == expected.read()
+    assert stats.records == 40
+    assert stats.unique == 8
+    assert stats.record_runs == -(-40 // run_size)
+    assert stats.spilled_bytes > 0
+
+
+def test_external_sort_gzipped(local_fastas, tmp_path):
+    stats = unique_genes.convert_to_unique_genes_external(
+        str(local_fastas / "simple_test.fasta.gz"),
+        str(tmp_path / "output.fasta.gz"),
+        run_size=2,
+        tmp_dir=str(tmp_path),
+    )
+    assert stats[:3] == (4, 2, 2)
+    with gzip.open(str(tmp_path / "output.fasta.gz"), "rt") as f:
+        assert f.read() == ">gene [locus_tags=AA11,BB22,CC33]\nAAAAAA\n" \
+            ">gene [locus_tags=DD44]\nGAAAAC\n"
+
+
+def test_external_sort_ambigious_gene_name(local_fastas, tmp_path):
+    with pytest.raises(NameError) as excinfo:
+        unique_genes.convert_to_unique_genes_external(
+            str(local_fastas / "two_gene_names.fasta"),
+            str(tmp_path / "output.fasta"),
+            run_size=1,
+        )
+    assert "Gene names differ between entries: 'gene2' vs. 'gene'" in str(excinfo.value)
@@ -1,11 +1,30 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from contextlib import ExitStack
 from copy import deepcopy
 import gzip
+import hashlib
+import heapq
 from io import StringIO
+from itertools import groupby
+from operator import itemgetter
+import pickle
+import shutil
+import struct
+import tempfile
 from Bio import SeqIO, SeqRecord
 
+LINE_WIDTH = 60
+DIGEST_SIZE = 16
+RUN_SIZE = 1_000_000
+SPILL_BATCH = 10_000
+MERGE_FANIN = 128
 
-def convert_to_unique_genes(filename_in, filename_out):
+TAG_HEADER = struct.Struct('<qI')
+
+SpillStats = namedtuple('SpillStats', 'records unique record_runs group_runs spilled_bytes')
+
+
+def convert_to_unique_genes(filename_in, filename_out, streaming=False, run_size=None):
     """
     Takes a standard FASTA file or gzipped FASTA file,
     de-duplicates the file, sorts by number of occurrences and
@@ -13,9 +32,18 @@ def convert_to_unique_genes(filename_in, filename_out):
 
     filename_in: str Filename of FASTA file containing duplicated genes
     filename_out: str Filename of FASTA file to output reduced file
+    streaming: bool Use convert_to_unique_genes_streaming, which keeps
+        one digest and a few numbers per unique sequence in memory and
+        spills the locus tags to a temporary file
+    run_size: int Use convert_to_unique_genes_external, sorting on disk
+        with at most run_size entries in memory
 
-    returns None
+    returns None, or the SpillStats of convert_to_unique_genes_external
     """
+    if run_size is not None:
+        return convert_to_unique_genes_external(filename_in, filename_out, run_size)
+    if streaming:
+        return convert_to_unique_genes_streaming(filename_in, filename_out)
     read_method = gzip.open if '.gz' in filename_in else open
     read_flags = "rt" if '.gz' in filename_in else "r"
     with read_method(filename_in, read_flags) as handle:
@@ -55,6 +83,289 @@ def get_converted_records(records):
     return new_records
 
 
+class _UniqueSequence:
+    """Occurrence count of one unique sequence, the offset of its first
+    record and the offset of its last locus tag in the tags file"""
+
+    __slots__ = ('offset', 'name', 'count', 'last_tag')
+
+    def __init__(self, offset, name):
+        self.offset = offset
+        self.name = name
+        self.count = 0
+        self.last_tag = -1
+
+
+def convert_to_unique_genes_streaming(filename_in, filename_out):
+    """
+    Same output as convert_to_unique_genes without holding the records in
+    memory. A first pass over filename_in keeps a BLAKE2 digest of every
+    upper cased sequence with its count and the file offset of its first
+    record; a second pass reads those records back by offset and writes
+    them to filename_out in count order.
+
+    Locus tags are appended to a temporary file as they are read, each
+    pointing back to the previous tag of the same sequence, so memory
+    grows with the number of unique sequences, not records. Gzipped
+    input cannot be seeked cheaply, so its first records are spooled to
+    another temporary file during the first pass instead.
+
+    returns None
+    """
+    read_method = gzip.open if '.gz' in filename_in else open
+    with ExitStack() as stack:
+        handle = stack.enter_context(read_method(filename_in, "rb"))
+        tags = stack.enter_context(tempfile.TemporaryFile())
+        spool = None
+        if '.gz' in filename_in:
+            spool = stack.enter_context(tempfile.TemporaryFile())
+        unique = _index_unique_sequences(handle, tags, spool)
+        source = handle if spool is None else spool
+        ordered = sorted(unique.values(), key=lambda item: item.count,
+                         reverse=True)
+        _check_gene_names(item.name for item in ordered)
+
+        write_method = gzip.open if '.gz' in filename_out else open
+        with write_method(filename_out, "wb") as out:
+            for item in ordered:
+                _write_record(out, item.name, _read_locus_tags(tags, item),
+                              _read_sequence(source, item.offset))
+
+
+def convert_to_unique_genes_external(filename_in, filename_out, run_size=RUN_SIZE,
+                                     tmp_dir=None):
+    """
+    Same output as convert_to_unique_genes for inputs whose unique
+    sequences do not fit in memory either. Holds at most about run_size
+    entries in memory at a time:
+
+    1. every record becomes a (digest, index, offset, name, locus tag)
+       entry; full buffers are sorted by digest and spilled as runs
+    2. a k-way merge of those runs groups equal digests into
+       (-count, first index, digest, offset, name, locus tags) entries,
+       spilled again as runs sorted by count
+    3. a k-way merge of the count runs gives the output order, each
+       record is read back from the input by its offset
+
+    Gzipped input is decompressed to a temporary file first so it can be
+    seeked. Runs are written to tmp_dir (default: the system temp dir)
+    and merged at most MERGE_FANIN at a time.
+
+    returns SpillStats(records, unique, record_runs, group_runs, spilled_bytes)
+    """
+    spilled = [0]
+    with tempfile.TemporaryFile(dir=tmp_dir) as plain:
+        if '.gz' in filename_in:
+            with gzip.open(filename_in, "rb") as handle:
+                shutil.copyfileobj(handle, plain)
+            source = plain
+        else:
+            source = open(filename_in, "rb")
+        with source:
+            source.seek(0)
+            record_runs, records = _spill_records(source, run_size, tmp_dir, spilled)
+            group_runs, unique, names = _spill_groups(
+                _reduce_runs(record_runs, tmp_dir, spilled), run_size, tmp_dir, spilled)
+            runs = _reduce_runs(group_runs, tmp_dir, spilled)
+            if len(names) > 1:
+                _check_gene_names(entry[4] for entry in heapq.merge(*map(_read_run, runs)))
+
+            write_method = gzip.open if '.gz' in filename_out else open
+            with write_method(filename_out, "wb") as out:
+                for _, _, _, offset, name, locus_tags in heapq.merge(*map(_read_run, runs)):
+                    _write_record(out, name, locus_tags, _read_sequence(source, offset))
+            for run in runs:
+                run.close()
+    return SpillStats(records, unique, len(record_runs), len(group_runs), spilled[0])
+
+
+def _spill_records(source, run_size, tmp_dir, spilled):
+    """
+    Phase 1: returns the runs of record entries sorted by digest and the
+    number of records
+    """
+    runs, buffer = [], []
+    records = 0
+    for index, (offset, title, sequence) in enumerate(_scan_fasta(source)):
+        description = title.decode()
+        name = description.split(None, 1)[0] if description else ''
+        digest = hashlib.blake2b(sequence.upper(), digest_size=DIGEST_SIZE).digest()
+        buffer.append((digest, index, offset, name.lower(),
+                       _strip_description_to_locus_tag(name, description)))
+        records += 1
+        if len(buffer) >= run_size:
+            runs.append(_spill(buffer, tmp_dir, spilled))
+    if buffer:
+        runs.append(_spill(buffer, tmp_dir, spilled))
+    return runs, records
+
+
+def _spill_groups(record_runs, run_size, tmp_dir, spilled):
+    """
+    Phase 2: returns the runs of unique sequence entries sorted by count,
+    the number of unique sequences and the set of their gene names.
+    Closes record_runs.
+    """
+    runs, buffer = [], []
+    unique = buffered = 0
+    names = set()
+    merged = heapq.merge(*map(_read_run, record_runs))
+    for digest, entries in groupby(merged, key=itemgetter(0)):
+        entries = list(entries)
+        _, index, offset, name, _ = entries[0]
+        buffer.append((-len(entries), index, digest, offset, name,
+                       [entry[4] for entry in entries]))
+        names.add(name)
+        unique += 1
+        buffered += len(entries)
+        if buffered >= run_size:
+            runs.append(_spill(buffer, tmp_dir, spilled))
+            buffered = 0
+    if buffer:
+        runs.append(_spill(buffer, tmp_dir, spilled))
+    for run in record_runs:
+        run.close()
+    return runs, unique, names
+
+
+def _write_run(entries, tmp_dir, spilled):
+    """
+    Writes sorted entries to a temporary file in pickled batches.
+    Adds the bytes written to spilled[0]
+    """
+    run = tempfile.TemporaryFile(dir=tmp_dir)
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= SPILL_BATCH:
+            pickle.dump(batch, run, protocol=pickle.HIGHEST_PROTOCOL)
+            batch = []
+    if batch:
+        pickle.dump(batch, run, protocol=pickle.HIGHEST_PROTOCOL)
+    spilled[0] += run.tell()
+    return run
+
+
+def _spill(buffer, tmp_dir, spilled):
+    buffer.sort()
+    run = _write_run(buffer, tmp_dir, spilled)
+    buffer.clear()
+    return run
+
+
+def _read_run(run):
+    run.seek(0)
+    while True:
+        try:
+            batch = pickle.load(run)
+        except EOFError:
+            return
+        yield from batch
+
+
+def _reduce_runs(runs, tmp_dir, spilled):
+    """
+    Merges runs MERGE_FANIN at a time until no more than MERGE_FANIN are
+    left, so a merge never holds too many open files
+    """
+    while len(runs) > MERGE_FANIN:
+        merged = []
+        for start in range(0, len(runs), MERGE_FANIN):
+            group = runs[start:start + MERGE_FANIN]
+            merged.append(_write_run(heapq.merge(*map(_read_run, group)), tmp_dir, spilled))
+            for run in group:
+                run.close()
+        runs = merged
+    return runs
+
+
+def _scan_fasta(handle):
+    """
+    Yields (offset, title, sequence) for every record of a binary FASTA
+    handle, ignoring anything before the first header line
+    """
+    offset = title = None
+    lines = []
+    position = 0
+    for line in handle:
+        if line.startswith(b'>'):
+            if title is not None:
+                yield offset, title, b''.join(lines)
+            offset, title, lines = position, line[1:].rstrip(), []
+        elif title is not None:
+            lines.append(line.rstrip().replace(b' ', b''))
+        position += len(line)
+    if title is not None:
+        yield offset, title, b''.join(lines)
+
+
+def _index_unique_sequences(handle, tags, spool=None):
+    """
+    First pass: maps the digest of every unique sequence to its
+    _UniqueSequence, in order of first appearance. Every locus tag is
+    appended to tags behind the offset of the previous tag of its
+    sequence. With spool the first record of each sequence is copied
+    there and offsets point into it.
+    """
+    unique = {}
+    for offset, title, sequence in _scan_fasta(handle):
+        digest = hashlib.blake2b(sequence.upper(),
+                                 digest_size=DIGEST_SIZE).digest()
+        description = title.decode()
+        name = description.split(None, 1)[0] if description else ''
+        item = unique.get(digest)
+        if item is None:
+            if spool is not None:
+                offset = spool.tell()
+                spool.write(b'>' + title + b'\n' + sequence + b'\n')
+            item = unique[digest] = _UniqueSequence(offset, name.lower())
+        item.count += 1
+        tag = _strip_description_to_locus_tag(name, description).encode()
+        position = tags.tell()
+        tags.write(TAG_HEADER.pack(item.last_tag, len(tag)) + tag)
+        item.last_tag = position
+    return unique
+
+
+def _read_locus_tags(tags, item):
+    """Follows the chain of locus tags of item back through tags"""
+    locus_tags = []
+    position = item.last_tag
+    while position != -1:
+        tags.seek(position)
+        position, size = TAG_HEADER.unpack(tags.read(TAG_HEADER.size))
+        locus_tags.append(tags.read(size).decode())
+    locus_tags.reverse()
+    return locus_tags
+
+
+def _check_gene_names(names):
+    expected_gene_name = None
+    for name in names:
+        if not expected_gene_name:
+            expected_gene_name = name
+        elif name != expected_gene_name:
+            raise NameError(f"Gene names differ between entries: '{expected_gene_name}' vs. '{name}'")
+
+
+def _read_sequence(handle, offset):
+    handle.seek(offset)
+    handle.readline()
+    lines = []
+    for line in handle:
+        if line.startswith(b'>'):
+            break
+        lines.append(line.rstrip().replace(b' ', b''))
+    return b''.join(lines)
+
+
+def _write_record(out, name, locus_tags, sequence):
+    tags_joined = ','.join(locus_tags)
+    out.write(f'>{name} [locus_tags={tags_joined}]\n'.encode())
+    for start in range(0, len(sequence), LINE_WIDTH):
+        out.write(sequence[start:start + LINE_WIDTH] + b'\n')
+
+
 def _strip_description_to_locus_tag(name, description):
     return (
         description
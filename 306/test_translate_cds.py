@@ -2,7 +2,7 @@ import pytest
 
 from Bio.Data.CodonTable import TranslationError
 
-from translate_cds import translate_cds
+from translate_cds import translate_cds, translate_cds_many, translate_fasta
 
 # Note on Bio.Seq table ids: These can be found in the
 # Seq.CodonTable.ambiguous_generic_by_name variable
@@ -106,4 +106,57 @@ def test_translate_cds_fail(cds, table):
     Test if function throws error when bad data is fed in
     """
     with pytest.raises(TranslationError):
-        translate_cds(cds, table)
\ No newline at end of file
+        translate_cds(cds, table)
+
+
+CDS = "ATGCCCGGGAAAGCGCACAAGAAGTGCTCAACGCCCCTACATCATCCGGGGTGA"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_translate_cds_many(workers):
+    """
+    Test if the batch API matches translate_cds and keeps input order
+    """
+    cds_sequences = [
+        CDS,
+        "ATGCCRGGGAAAGCGCACAAGAAGTGCTCAACGCCCCTACATCATCCGGGGTGA",
+        "ATGCRCGGGAAAGCGCACAAGAAGTGCTCAACGCCCCTACATCATCCGGGGTGA",
+        "ATGC\u00A0CCG\tGGA AAG CGCA\u2009CAAGAAGTG\nCTCAACGC\tCCCTA\rCA TCA TCCGGGGTAA",
+        "atgtga",
+    ] * 5
+    expected = [translate_cds(cds, "Standard") for cds in cds_sequences]
+    result = translate_cds_many(cds_sequences, "Standard", workers=workers, batch_size=3)
+    assert list(result) == expected
+
+
+@pytest.mark.parametrize("table", ["Vertebrate Mitochondrial", "Bacterial", 11])
+def test_translate_cds_many_tables(table):
+    cds_sequences = ["GTG" + CDS[3:-3] + "TAA", "TTG" + CDS[3:-3] + "TAA", "TTGTAA"]
+    expected = []
+    for cds in cds_sequences:
+        try:
+            expected.append(translate_cds(cds, table))
+        except TranslationError:
+            expected.append(None)
+    assert list(translate_cds_many(cds_sequences, table, skip_invalid=True)) == expected
+
+
+@pytest.mark.parametrize("cds", ["ATGAA", "ATGAAA", "TTTTAA", "ATGTAATAA"])
+def test_translate_cds_many_fail(cds):
+    """
+    Test if invalid CDS raise, or give None with skip_invalid
+    """
+    with pytest.raises(TranslationError):
+        list(translate_cds_many([CDS, cds], "Standard"))
+    result = translate_cds_many([CDS, cds, CDS], "Standard", skip_invalid=True)
+    assert list(result) == ["MPGKAHKKCSTPLHHPG", None, "MPGKAHKKCSTPLHHPG"]
+
+
+def test_translate_fasta(tmp_path):
+    fasta = tmp_path / "cds.fasta"
+    fasta.write_text(f">gene1 first\n{CDS[:30]}\n{CDS[30:]}\n>gene2\nATGTAATAA\n>gene3\nATGTGA\n")
+    assert list(translate_fasta(str(fasta), "Standard", workers=2, skip_invalid=True)) == [
+        ("gene1 first", "MPGKAHKKCSTPLHHPG"),
+        ("gene2", None),
+        ("gene3", "M"),
+    ]
@@ -1,6 +1,68 @@
+import os
 import string
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
+from Bio.Data import CodonTable
+from Bio.Data.CodonTable import TranslationError
 from Bio.Seq import Seq
+from Bio.SeqIO.FastaIO import SimpleFastaParser
+
+WHITESPACE = string.whitespace.encode()
+BATCH_SIZE = 1000
+STOP = ord('*')
+
+# A, C, G and T to 2 bit codes, every other byte to 4
+BASE_CODES = np.full(256, 4, dtype=np.uint8)
+BASE_CODES[list(b'ACGT')] = range(4)
+
+
+def _clean(cds: str) -> bytes:
+    """
+    Drop non ASCII and whitespace characters and upper case cds
+    """
+    return cds.encode('ascii', 'ignore').translate(None, WHITESPACE).upper()
+
+
+@lru_cache(maxsize=None)
+def get_codon_table(translation_table: Union[str, int]) -> CodonTable.CodonTable:
+    """
+    :param translation_table: str or int: name or NCBI id of a translation table
+    :return: CodonTable: the (cached) ambiguous table Bio.Seq.Seq.translate uses
+    """
+    if isinstance(translation_table, int):
+        return CodonTable.ambiguous_generic_by_id[translation_table]
+    return CodonTable.ambiguous_generic_by_name[translation_table]
+
+
+@lru_cache(maxsize=None)
+def _numpy_table(translation_table: Union[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    64 entry amino acid (stop codons as '*') and start codon lookups,
+    indexed by the 6 bit code of an unambiguous codon
+    """
+    if isinstance(translation_table, int):
+        table = CodonTable.unambiguous_dna_by_id[translation_table]
+    else:
+        table = CodonTable.unambiguous_dna_by_name[translation_table]
+    amino_acids = np.full(64, STOP, dtype=np.uint8)
+    starts = np.zeros(64, dtype=bool)
+    for index in range(64):
+        codon = ''.join('ACGT'[index >> shift & 3] for shift in (4, 2, 0))
+        if codon in table.forward_table:
+            amino_acids[index] = ord(table.forward_table[codon])
+        starts[index] = codon in table.start_codons
+    return amino_acids, starts
+
+
+def _translate_cleaned(cds: bytes, translation_table: Union[str, int]) -> str:
+    seq = Seq(cds.decode())
+    translation = seq.translate(table=get_codon_table(translation_table), cds=True)
+    return str(translation)
 
 
 def translate_cds(cds: str, translation_table: str) -> str:
@@ -9,7 +71,91 @@ def translate_cds(cds: str, translation_table: str) -> str:
     :param translation_table: str: translation table as defined in Bio.Seq.Seq.CodonTable.ambiguous_generic_by_name
     :return: str: Protein sequence
     """
-    cds_cleaned = cds.encode('ascii', 'ignore').decode().translate(str.maketrans('', '', string.whitespace)).upper()
-    seq = Seq(cds_cleaned)
-    translation = seq.translate(table=translation_table, cds=True)
-    return str(translation)
+    return _translate_cleaned(_clean(cds), translation_table)
+
+
+def _translate_batch(batch: List[str], translation_table: Union[str, int],
+                     skip_invalid: bool = False) -> List[Optional[str]]:
+    """
+    Translate a list of CDS. Unambiguous ones are concatenated into a
+    single buffer and translated with one NumPy lookup; ambiguous or
+    invalid ones go through Biopython (which raises the TranslationError).
+    """
+    amino_acids, starts = _numpy_table(translation_table)
+    cleaned = [_clean(cds) for cds in batch]
+    fast = [index for index, cds in enumerate(cleaned)
+            if len(cds) >= 6 and len(cds) % 3 == 0
+            and not cds.translate(None, b'ACGT')]
+    results: List[Optional[str]] = [None] * len(batch)
+    if fast:
+        codes = BASE_CODES[np.frombuffer(b''.join(cleaned[index] for index in fast),
+                                         dtype=np.uint8)].reshape(-1, 3)
+        codons = codes[:, 0] << 4 | codes[:, 1] << 2 | codes[:, 2]
+        proteins = amino_acids[codons]
+        first = 0
+        for index in fast:
+            last = first + len(cleaned[index]) // 3
+            protein = proteins[first:last]
+            if (starts[codons[first]] and protein[-1] == STOP
+                    and not (protein[1:-1] == STOP).any()):
+                results[index] = 'M' + protein[1:-1].tobytes().decode()
+            first = last
+    for index, cds in enumerate(cleaned):
+        if results[index] is None:
+            try:
+                results[index] = _translate_cleaned(cds, translation_table)
+            except TranslationError:
+                if not skip_invalid:
+                    raise
+    return results
+
+
+def translate_cds_many(cds_sequences: Iterable[str], translation_table: str,
+                       workers: Optional[int] = 1, batch_size: int = BATCH_SIZE,
+                       skip_invalid: bool = False) -> Iterator[Optional[str]]:
+    """
+    :param cds_sequences: iterable of str: DNA coding sequences
+    :param translation_table: str: translation table as for translate_cds
+    :param workers: int: processes to use, None for one per CPU, 1 to stay in this process
+    :param batch_size: int: sequences sent to a worker at once
+    :param skip_invalid: bool: yield None instead of raising TranslationError
+    :return: iterator of str: protein sequences, in input order
+    """
+    cds_sequences = iter(cds_sequences)
+    batches = iter(lambda: list(islice(cds_sequences, batch_size)), [])
+    if workers == 1:
+        for batch in batches:
+            yield from _translate_batch(batch, translation_table, skip_invalid)
+        return
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for batch in batches:
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_translate_batch, batch,
+                                           translation_table, skip_invalid))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def translate_fasta(path: str, translation_table: str, workers: Optional[int] = 1,
+                    batch_size: int = BATCH_SIZE,
+                    skip_invalid: bool = False) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    :param path: str: FASTA file of coding sequences
+    :return: iterator of (title, protein sequence) tuples, see translate_cds_many
+    """
+    with open(path) as handle:
+        titles = deque()
+
+        def sequences():
+            for title, cds in SimpleFastaParser(handle):
+                titles.append(title)
+                yield cds
+
+        proteins = translate_cds_many(sequences(), translation_table, workers,
+                                      batch_size, skip_invalid)
+        for protein in proteins:
+            yield titles.popleft(), protein
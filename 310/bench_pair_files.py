@@ -0,0 +1,64 @@
+"""Benchmark pairing a synthetic sequencing run listing.
+
+Run with: python bench_pair_files.py [number of filenames, default 1000000]
+                                     [files for the scandir run, default 20000]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+from pair_files import iter_pairs, pair_directory, pair_files
+
+
+def synthetic_listing(count, seed=310):
+    """count filenames: lanes of R1/R2 mates, unpaired files and noise,
+    listed lane by lane with the files of each lane shuffled"""
+    rnd = Random(seed)
+    filenames = []
+    lane = []
+    for index in range(count // 2):
+        sample, s_index = f'Sample{index // 400}', index // 400 % 100
+        stem = f'{sample}_S{s_index}_L{index // 100 % 1000:03d}'
+        chunk = index % 100
+        lane.append(f'{stem}_R1_{chunk:03d}.fastq.gz')
+        lane.append(f'{stem}_R2_{chunk:03d}.fastq.gz'
+                    if index % 50 else f'{stem}_R1_{chunk:03d}.md5.gz')
+        if chunk == 99:
+            rnd.shuffle(lane)
+            filenames.extend(lane)
+            lane = []
+    filenames.extend(lane)
+    return filenames
+
+
+def timed(label, func):
+    start = perf_counter()
+    pairs = sum(1 for _ in func())
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    sum(1 for _ in func())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{label:<28} {pairs:>10,} pairs {elapsed:>8.3f}s'
+          f' {peak / 2 ** 20:>8.1f} MiB peak')
+
+
+def main(count=1_000_000, files=20_000):
+    filenames = synthetic_listing(count)
+    print(f'{len(filenames):,} filenames')
+    timed('pair_files (list)', lambda: pair_files(filenames))
+    timed('iter_pairs (generator)', lambda: iter_pairs(iter(filenames)))
+
+    with tempfile.TemporaryDirectory() as run:
+        for index, filename in enumerate(synthetic_listing(files)):
+            lane = os.path.join(run, f'lane{index // 1000}')
+            os.makedirs(lane, exist_ok=True)
+            open(os.path.join(lane, filename), 'w').close()
+        timed(f'pair_directory ({files:,})', lambda: pair_directory(run))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
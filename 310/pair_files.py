@@ -1,6 +1,11 @@
 from collections import defaultdict
+import os
 import re
 
+FASTQ_PATTERN = re.compile(
+    r'(.*)_S([0-9]{1,2})_L([0-9]{1,3})_R([12])_([0-9]{3})\.fastq\.gz',
+    flags=re.IGNORECASE)
+
 
 def pair_files(filenames):
     """
@@ -10,10 +15,8 @@ def pair_files(filenames):
     returns: list[tuple[str, str]] containing filename pairs
     """
     filenames_processed = defaultdict(dict)
-    pattern = r'(.*)_S([0-9]{1,2})_L([0-9]{1,3})_R([12])_([0-9]{3})\.fastq\.gz'
-    regex = re.compile(pattern, flags=re.IGNORECASE)
     for filename in filenames:
-        matches = regex.fullmatch(filename)
+        matches = FASTQ_PATTERN.fullmatch(filename)
         if matches:
             match_indexes = matches.groups()
             non_r_indexes = match_indexes[0], match_indexes[1], match_indexes[2], match_indexes[4]
@@ -28,6 +31,72 @@ def pair_files(filenames):
     return pairs
 
 
+def _pair_entries(entries):
+    """
+    Yield (R1 path, R2 path) for (name, path) entries as soon as both
+    mates have been seen, keeping only the unpaired ones in memory
+    """
+    unpaired = {}
+    for name, path in entries:
+        matches = FASTQ_PATTERN.fullmatch(name)
+        if not matches:
+            continue
+        sample, s_index, lane, r_index, chunk = matches.groups()
+        key = sample, s_index, lane, chunk
+        mate = unpaired.pop((key, '2' if r_index == '1' else '1'), None)
+        if mate is None:
+            unpaired[key, r_index] = path
+        elif r_index == '1':
+            yield path, mate
+        else:
+            yield mate, path
+
+
+def iter_pairs(filenames):
+    """
+    Generator version of pair_files, yields each pair as soon as both
+    mates have been seen
+
+    filenames: iterable of str containing filenames
+    returns: iterator of tuple[str, str] containing filename pairs
+    """
+    return _pair_entries((filename, filename) for filename in filenames)
+
+
+def _scan_files(directory, subdirectories):
+    """
+    Lazily yield (name, path) of the files in directory, appending the
+    paths of its subdirectories to subdirectories
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file():
+                yield entry.name, entry.path
+
+
+def pair_directory(path, recursive=True):
+    """
+    Pairs the FASTQ files of a (huge) sequencing run directory
+
+    Directories are listed lazily with os.scandir, one at a time, and
+    pairs are yielded as soon as both mates are seen. Mates of a lane
+    live in the same directory, so whatever is still unpaired when a
+    directory is done is dropped before moving on to the next one.
+
+    path: str directory to pair the files of
+    recursive: bool also pair the files in all subdirectories
+    returns: iterator of tuple[str, str] containing file path pairs
+    """
+    directories = [path]
+    while directories:
+        subdirectories = []
+        yield from _pair_entries(_scan_files(directories.pop(), subdirectories))
+        if recursive:
+            directories.extend(reversed(subdirectories))
+
+
 # Set up for your convenience during testing
 if __name__ == "__main__":
     filenames = [
@@ -1,6 +1,6 @@
 import pytest
 
-from pair_files import pair_files
+from pair_files import iter_pairs, pair_directory, pair_files
 
 
 @pytest.mark.parametrize(
@@ -256,4 +256,49 @@ from pair_files import pair_files
 )
 def test_pair_files(test_description, test_input, expected):
     print(f"Test_pair_files {test_description}")
-    assert sorted(pair_files(test_input)) == expected
\ No newline at end of file
+    assert sorted(pair_files(test_input)) == expected
+
+
+def test_iter_pairs():
+    filenames = [
+        "C.elegans_S3_L001_R2_001.fastq.gz",
+        "NCTC8325_S1_L001_R1_001.fastq.gz",
+        "NCTC8325_S1_L001_R1_001.md5.gz",
+        "E.coliK12_S2_l001_r2_001.FASTQ.GZ",
+        "NCTC8325_S1_L001_R2_001.fastq.gz",
+        "E.coliK12_S2_L001_R1_001.fastq.gz",
+        "C.elegans_S4_L001_R1_001.fastq.gz",
+        "folder/C.elegans_S3_L001_R1_001.fastq.gz",
+    ]
+    pairs = iter_pairs(iter(filenames))
+    assert next(pairs) == (
+        "NCTC8325_S1_L001_R1_001.fastq.gz",
+        "NCTC8325_S1_L001_R2_001.fastq.gz",
+    )
+    assert list(pairs) == [
+        ("E.coliK12_S2_L001_R1_001.fastq.gz", "E.coliK12_S2_l001_r2_001.FASTQ.GZ"),
+    ]
+
+
+def test_pair_directory(tmp_path):
+    run = tmp_path / "run"
+    lane2 = run / "lane2"
+    empty = run / "lane2" / "empty"
+    empty.mkdir(parents=True)
+    for directory, filenames in [
+        (run, ["A_S1_L001_R1_001.fastq.gz", "A_S1_L001_R2_001.fastq.gz",
+               "B_S2_L001_R1_001.fastq.gz", "A_S1_L001_R1_001.md5.gz"]),
+        (lane2, ["A_S1_L002_R1_001.fastq.gz", "A_s1_l002_r2_001.FASTQ.GZ",
+                 "B_S2_L001_R2_001.fastq.gz"]),
+    ]:
+        for filename in filenames:
+            (directory / filename).touch()
+    (run / "C_S3_L001_R1_001.fastq.gz").mkdir()
+
+    assert sorted(pair_directory(str(run))) == [
+        (str(run / "A_S1_L001_R1_001.fastq.gz"), str(run / "A_S1_L001_R2_001.fastq.gz")),
+        (str(lane2 / "A_S1_L002_R1_001.fastq.gz"), str(lane2 / "A_s1_l002_r2_001.FASTQ.GZ")),
+    ]
+    assert list(pair_directory(str(run), recursive=False)) == [
+        (str(run / "A_S1_L001_R1_001.fastq.gz"), str(run / "A_S1_L001_R2_001.fastq.gz")),
+    ]
@@ -0,0 +1,53 @@
+"""Compare binary_search against the old recursive version and bisect.
+
+Run with: python bench_binary_search.py
+"""
+from array import array
+from bisect import bisect_left
+from random import sample, seed
+from timeit import timeit
+
+from binary_search import binary_search, binary_search_many
+
+
+def recursive_binary_search(sequence, target):
+    """The original slicing implementation, kept for comparison."""
+    def _recurse(enumerated_seq, target):
+        if len(enumerated_seq) == 1:
+            return enumerated_seq[0][0] if enumerated_seq[0][1] == target else None
+        i = len(enumerated_seq) // 2
+        if enumerated_seq[i][1] > target:
+            return _recurse(enumerated_seq[0:i], target)
+        elif enumerated_seq[0][1] == target:
+            return enumerated_seq[0][0]
+        else:
+            return _recurse(enumerated_seq[i:], target)
+
+    return _recurse(list(enumerate(sequence)), target)
+
+
+def bisect_search(sequence, target):
+    idx = bisect_left(sequence, target)
+    return idx if idx < len(sequence) and sequence[idx] == target else None
+
+
+def main(size=1_000_000, queries=1_000):
+    seed(40)
+    ids = sorted(sample(range(size * 10), size))
+    ids_array = array('q', ids)
+    targets = sample(range(size * 10), queries)
+
+    def run(func, seq):
+        return [func(seq, t) for t in targets]
+
+    print(f'{queries} lookups in {size:,} sorted ids')
+    print(f"recursive (list):   {timeit(lambda: run(recursive_binary_search, ids[:10_000]), number=1):.3f}s"
+          " (only first 10k ids, the full list is too slow)")
+    print(f"iterative (list):   {timeit(lambda: run(binary_search, ids), number=1):.3f}s")
+    print(f"iterative (array):  {timeit(lambda: run(binary_search, ids_array), number=1):.3f}s")
+    print(f"bisect (list):      {timeit(lambda: run(bisect_search, ids), number=1):.3f}s")
+    print(f"batch (list):       {timeit(lambda: binary_search_many(ids, targets), number=1):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,52 @@
 def binary_search(sequence, target):
-    def _recurse(enumerated_seq, target):
-        if len(enumerated_seq) == 1:
-            return enumerated_seq[0][0] if enumerated_seq[0][1] == target else None       
-        i = len(enumerated_seq) // 2
-        if enumerated_seq[i][1] > target:
-            return _recurse(enumerated_seq[0:i], target)
-        elif enumerated_seq[0][1] == target:
-            return enumerated_seq[0][0]
+    """Return the index of target in the sorted sequence, or None.
+
+    Works on anything indexable (list, tuple, array.array, memoryview)
+    without copying or slicing it.
+    """
+    lo, hi = 0, len(sequence)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if sequence[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(sequence) and sequence[lo] == target:
+        return lo
+    return None
+
+
+def _lower_bound(sequence, target, lo, hi):
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if sequence[mid] < target:
+            lo = mid + 1
         else:
-            return _recurse(enumerated_seq[i:], target)
+            hi = mid
+    return lo
+
+
+def binary_search_many(sequence, targets):
+    """Look up many targets in one pass over the sorted sequence.
 
-    
-    enumerated_seq = list(enumerate(sequence))
-    return _recurse(enumerated_seq, target)
+    Targets are visited in sorted order and each search gallops forward
+    from where the previous one ended, so a sorted batch of k targets
+    costs O(k log(n/k)) comparisons instead of O(k log n).
+    Results come back in the order of targets, None where not found.
+    """
+    targets = list(targets)
+    results = [None] * len(targets)
+    size = len(sequence)
+    lo = 0
+    for pos in sorted(range(len(targets)), key=targets.__getitem__):
+        target = targets[pos]
+        # gallop: double the step until we overshoot the target
+        step, hi = 1, lo
+        while hi < size and sequence[hi] < target:
+            lo = hi + 1
+            hi = lo + step
+            step *= 2
+        lo = _lower_bound(sequence, target, lo, min(hi, size))
+        if lo < size and sequence[lo] == target:
+            results[pos] = lo
+    return results
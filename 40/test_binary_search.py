@@ -1,6 +1,7 @@
+from array import array
 from string import ascii_lowercase
 
-from binary_search import binary_search
+from binary_search import binary_search, binary_search_many
 
 PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61]
 ALPHABET = list(ascii_lowercase)
@@ -17,4 +18,30 @@ def test_binary_search_prime():
 def test_binary_search_alpha():
     assert binary_search(ALPHABET, 'u') == 20
     assert binary_search(ALPHABET, 'a') == 0
-    assert binary_search(ALPHABET, 'z') == 25
\ No newline at end of file
+    assert binary_search(ALPHABET, 'z') == 25
+
+
+def test_binary_search_empty():
+    assert binary_search([], 1) is None
+
+
+def test_binary_search_array_and_memoryview():
+    ints = array('i', PRIMES)
+    assert binary_search(ints, 37) == 11
+    assert binary_search(memoryview(ints), 61) == 17
+    assert binary_search(memoryview(ints), 4) is None
+
+
+def test_binary_search_many():
+    targets = [61, 2, 18, 37, 100, 0, 5]
+    assert binary_search_many(PRIMES, targets) == [17, 0, None, 11,
+                                                   None, None, 2]
+    assert binary_search_many(ALPHABET, 'zua') == [25, 20, 0]
+    assert binary_search_many(PRIMES, []) == []
+
+
+def test_binary_search_many_matches_single():
+    numbers = array('q', range(0, 30_000, 3))
+    targets = list(range(-5, 30_010, 7))
+    expected = [binary_search(numbers, t) for t in targets]
+    assert binary_search_many(memoryview(numbers), targets) == expected
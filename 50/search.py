@@ -1,8 +1,20 @@
+from bisect import insort
 from collections import namedtuple
 from datetime import date
-from operator import attrgetter
+from functools import lru_cache
+from heapq import merge
+from pathlib import Path
+import re
+import sys
+
 import feedparser
 
+# feedcache is shared with bite 220 and lives in ../shared
+SHARED = str(Path(__file__).resolve().parent.parent / 'shared')
+if SHARED not in sys.path:
+    sys.path.insert(0, SHARED)
+from feedcache import FeedCache  # noqa: E402
+
 FEED = 'https://bites-data.s3.us-east-2.amazonaws.com/all.rss.xml'
 
 Entry = namedtuple('Entry', 'date title link tags')
@@ -17,11 +29,15 @@ def _convert_struct_time_to_dt(stime):
     return date(year=stime.tm_year, month=stime.tm_mon, day=stime.tm_mday)
 
 
-def get_feed_entries(feed=FEED):
+def get_feed_entries(feed=FEED, cache=None):
     """Use feedparser to parse PyBites RSS feed.
         Return a list of Entry namedtuples (date = date, drop time part)
+        Pass a feedcache.FeedCache to only re-parse the feed if it changed.
      """
-    feed = feedparser.parse(FEED)
+    if cache is not None:
+        feed = {'entries': cache.entries(feed)}
+    else:
+        feed = feedparser.parse(feed)
     return [
         Entry(
             date=_convert_struct_time_to_dt(x['published_parsed']),
@@ -56,8 +72,132 @@ def filter_entries_by_tag(search, entry):
     
 
 
-def main():
+@lru_cache(maxsize=256)
+def compile_query(search):
+    """Parse a tag search into a tree of ('tag', name), ('and', children)
+       and ('or', children) nodes. & binds tighter than |, parentheses
+       group, so 'flask&(api|rest)|django' is supported too.
+       Raises ValueError on unbalanced parentheses or empty terms.
+    """
+    tokens = [token.strip()
+              for token in re.findall(r'[&|()]|[^&|()]+', search.lower())
+              if token.strip()]
+    pos = 0
+
+    def parse_or():
+        nonlocal pos
+        children = [parse_and()]
+        while pos < len(tokens) and tokens[pos] == '|':
+            pos += 1
+            children.append(parse_and())
+        return children[0] if len(children) == 1 else ('or', tuple(children))
+
+    def parse_and():
+        nonlocal pos
+        children = [parse_term()]
+        while pos < len(tokens) and tokens[pos] == '&':
+            pos += 1
+            children.append(parse_term())
+        return children[0] if len(children) == 1 else ('and', tuple(children))
+
+    def parse_term():
+        nonlocal pos
+        if pos < len(tokens) and tokens[pos] == '(':
+            pos += 1
+            node = parse_or()
+            if pos == len(tokens) or tokens[pos] != ')':
+                raise ValueError(f'Unbalanced parentheses in {search!r}')
+            pos += 1
+            return node
+        if pos == len(tokens) or tokens[pos] in '&|)':
+            raise ValueError(f'Missing search term in {search!r}')
+        pos += 1
+        return ('tag', tokens[pos - 1])
+
+    tree = parse_or()
+    if pos != len(tokens):
+        raise ValueError(f'Unbalanced parentheses in {search!r}')
+    return tree
+
+
+class FeedIndex:
+    """Inverted tag index over feed entries.
+
+       Every tag maps to a posting list of (date, seq) keys kept in
+       sorted order, so & and | queries are answered by intersecting and
+       merging posting lists and come back in date order without a scan
+       over all entries. New entries can be added at any time.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = {}
+        self.postings = {}
+        self._links = set()
+        self.update(entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entry):
+        """Index entry, returns False if an entry with its link is known."""
+        if entry.link in self._links:
+            return False
+        key = (entry.date, len(self.entries))
+        self.entries[key] = entry
+        self._links.add(entry.link)
+        for tag in set(entry.tags):
+            posting = self.postings.setdefault(tag, [])
+            if not posting or posting[-1] < key:
+                posting.append(key)
+            else:
+                insort(posting, key)
+        return True
+
+    def update(self, entries):
+        """Index new entries, returns how many were added."""
+        return sum(self.add(entry) for entry in entries)
+
+    def _estimate(self, node):
+        kind, value = node
+        if kind == 'tag':
+            return len(self.postings.get(value, ()))
+        sizes = [self._estimate(child) for child in value]
+        return min(sizes) if kind == 'and' else sum(sizes)
+
+    def _evaluate(self, node):
+        kind, value = node
+        if kind == 'tag':
+            return self.postings.get(value, [])
+        if kind == 'or':
+            keys, last = [], None
+            for key in merge(*(self._evaluate(child) for child in value)):
+                if key != last:
+                    keys.append(key)
+                    last = key
+            return keys
+        # and: walk the smallest operand, probe the others as sets
+        children = sorted(value, key=self._estimate)
+        keys = self._evaluate(children[0])
+        for child in children[1:]:
+            if not keys:
+                break
+            others = set(self._evaluate(child))
+            keys = [key for key in keys if key in others]
+        return keys
+
+    def search(self, search):
+        """Return the entries matching search (see compile_query),
+           ordered by date ascending.
+        """
+        return [self.entries[key]
+                for key in self._evaluate(compile_query(search))]
+
+
+def main(cache=None):
     """Entry point to the program
+       The feed is read through cache, a FeedCache in $TMP/feedcache by
+       default, so it is only parsed again when it changed. Pass
+       cache=False to always fetch and parse it.
        1. Call get_feed_entries and store them in entries
        2. Initiate an infinite loop
        3. Ask user for a search term:
@@ -68,7 +208,9 @@ def main():
        6. Secondly, print the number of matches: 'n entries matched'
           (use entry if only 1 match)
     """
-    entries = get_feed_entries()
+    if cache is None:
+        cache = FeedCache()
+    index = FeedIndex(get_feed_entries(cache=cache or None))
     exit_triggered = False
     while not exit_triggered:
         query = input('Search term: ')
@@ -78,8 +220,11 @@ def main():
             exit_triggered = True
             print('Bye')
         else:
-            matching_entries = [entry for entry in entries if filter_entries_by_tag(query, entry)]
-            matching_entries.sort(key=attrgetter('date'))
+            try:
+                matching_entries = index.search(query)
+            except ValueError as exc:
+                print(exc)
+                continue
             for entry in matching_entries:
                 print(entry.title)
             count = len(matching_entries)
@@ -3,8 +3,10 @@ from unittest.mock import patch
 
 import pytest
 
-from search import (_convert_struct_time_to_dt, get_feed_entries,
-                    filter_entries_by_tag, main, Entry)
+import search
+from search import (FeedCache, _convert_struct_time_to_dt, get_feed_entries,
+                    filter_entries_by_tag, main, Entry, FeedIndex,
+                    compile_query)
 
 
 class AttrDict(dict):
@@ -101,7 +103,7 @@ def test_filter_entries_by_tag(arg, ret):
                                       'python|regex', 'python&regex', 'REGeX',
                                       '', 'q'])
 def test_main(entries, inp, capfd):
-    main()
+    main(cache=False)
     out, _ = capfd.readouterr()
 
     output = [line for line in out.split('\n') if line.strip()]
@@ -118,4 +120,84 @@ def test_main(entries, inp, capfd):
     assert len(output) == len(expected)
 
     for line, exp in zip(output, expected):
-        assert exp in line
\ No newline at end of file
+        assert exp in line
+
+ENTRIES = [
+    Entry(date=date(2018, 3, 1), title='Flask API', link='l1',
+          tags=['flask', 'api', 'python']),
+    Entry(date=date(2017, 5, 2), title='Django REST', link='l2',
+          tags=['django', 'api', 'python']),
+    Entry(date=date(2019, 1, 3), title='Regex tips', link='l3',
+          tags=['regex', 'tips', 'python']),
+    Entry(date=date(2016, 7, 4), title='Flask forms', link='l4',
+          tags=['flask', 'forms']),
+]
+
+
+@pytest.mark.parametrize("query, titles", [
+    ('python', ['Django REST', 'Flask API', 'Regex tips']),
+    ('FLASK', ['Flask forms', 'Flask API']),
+    ('flask&api', ['Flask API']),
+    ('flask|django', ['Flask forms', 'Django REST', 'Flask API']),
+    ('api&python&django', ['Django REST']),
+    ('pyramid|regex', ['Regex tips']),
+    ('flask&pyramid', []),
+    ('python&api|forms', ['Flask forms', 'Django REST', 'Flask API']),
+    ('python & (flask | regex)', ['Flask API', 'Regex tips']),
+    ('(django|flask)&(forms|api)&python', ['Django REST', 'Flask API']),
+])
+def test_feed_index_search(query, titles):
+    index = FeedIndex(ENTRIES)
+    assert [entry.title for entry in index.search(query)] == titles
+
+
+def test_feed_index_matches_filter():
+    index = FeedIndex(ENTRIES)
+    for query in ('python', 'api&flask', 'regex|forms|nope', 'nope'):
+        expected = sorted((entry for entry in ENTRIES
+                           if filter_entries_by_tag(query, entry)),
+                          key=lambda entry: entry.date)
+        assert index.search(query) == expected
+
+
+def test_feed_index_incremental():
+    index = FeedIndex(ENTRIES[:2])
+    assert index.update(ENTRIES) == 2
+    assert len(index) == 4
+    assert index.add(ENTRIES[0]) is False
+    assert [entry.title for entry in index.search('flask')] == [
+        'Flask forms', 'Flask API']
+
+
+@pytest.mark.parametrize("query", ['flask&', '(flask', 'flask)', '|', ''])
+def test_compile_query_invalid(query):
+    with pytest.raises(ValueError):
+        compile_query(query)
+
+
+def test_get_feed_entries_cached(tmp_path):
+    feed = tmp_path / 'feed.xml'
+    feed.write_text('<?xml version="1.0"?><rss version="2.0"><channel>'
+                    '<item><title>Flask tips</title><link>https://x/1</link>'
+                    '<pubDate>Sun, 18 Feb 2018 20:52:00 +0100</pubDate>'
+                    '<category>Flask</category></item></channel></rss>')
+    cache = FeedCache(tmp_path / 'cache')
+    entries = get_feed_entries(str(feed), cache=cache)
+    assert entries == get_feed_entries(str(feed), cache=cache)
+    assert entries == [Entry(date=date(2018, 2, 18), title='Flask tips',
+                             link='https://x/1', tags=['flask'])]
+    assert cache.parses == 1
+
+
+@patch("builtins.input", side_effect=['q'])
+def test_main_reads_through_feed_cache(inp, monkeypatch):
+    class FakeCache:
+        urls = []
+
+        def entries(self, url):
+            self.urls.append(url)
+            return []
+
+    monkeypatch.setattr(search, 'FeedCache', FakeCache)
+    main()
+    assert FakeCache.urls == [search.FEED]
@@ -0,0 +1,124 @@
+"""On-disk cache for parsed RSS feeds.
+
+Each feed is stored as a gzipped pickle holding its ETag/Last-Modified
+validators, a digest of the last fetched body and the parsed entries.
+The feed is only fetched with a conditional GET and only re-parsed when
+its content actually changed; new entries are merged into the cached ones.
+Local paths (and file:// urls) work as a stand-in for HTTP feeds, using
+the file's mtime as Last-Modified. When a feed cannot be reached the
+cached entries are returned, so polling keeps working while offline.
+
+Shared by bites 50 and 220: search.py and pybytes.py put this directory
+on sys.path before importing it.
+"""
+import gzip
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+from urllib.request import Request, url2pathname, urlopen
+
+import feedparser
+
+TMP = Path(os.getenv("TMP", "/tmp"))
+CACHE_DIR = TMP / "feedcache"
+NOT_MODIFIED = 304
+TIMEOUT = 30
+
+
+def _fetch_http(url, etag, modified):
+    """Conditional GET, returns (body or None if unchanged, etag, modified)."""
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if modified:
+        headers['If-Modified-Since'] = modified
+    try:
+        with urlopen(Request(url, headers=headers),
+                     timeout=TIMEOUT) as response:
+            return (response.read(), response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'))
+    except HTTPError as exc:
+        if exc.code == NOT_MODIFIED:
+            return None, etag, modified
+        raise
+
+
+def _fetch_file(path, etag, modified):
+    """Same contract as _fetch_http for a local file."""
+    mtime = str(os.stat(path).st_mtime_ns)
+    if mtime == modified:
+        return None, etag, modified
+    with open(path, 'rb') as f:
+        return f.read(), None, mtime
+
+
+def fetch(url, etag=None, modified=None):
+    parsed = urlparse(url)
+    if parsed.scheme in ('http', 'https'):
+        return _fetch_http(url, etag, modified)
+    if parsed.scheme == 'file':
+        return _fetch_file(url2pathname(parsed.path), etag, modified)
+    return _fetch_file(url, etag, modified)
+
+
+def _entry_key(entry):
+    return entry.get('id') or entry.get('link') or entry.get('title')
+
+
+def merge_entries(cached, fresh):
+    """Fresh entries first (feed order), then cached ones no longer in
+       the feed; a fresh entry replaces a cached one with the same id.
+    """
+    fresh_keys = {_entry_key(entry) for entry in fresh}
+    return list(fresh) + [entry for entry in cached
+                          if _entry_key(entry) not in fresh_keys]
+
+
+class FeedCache:
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.parses = 0
+
+    def _path(self, url):
+        name = hashlib.sha1(str(url).encode()).hexdigest()
+        return self.directory / f'{name}.pickle.gz'
+
+    def _load(self, url):
+        try:
+            with gzip.open(self._path(url), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return {'etag': None, 'modified': None, 'digest': None,
+                    'entries': []}
+
+    def _save(self, url, state):
+        path = self._path(url)
+        tmp = path.with_suffix('.tmp')
+        with gzip.open(tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def entries(self, url):
+        """Return the entries of the feed at url, parsing only if changed."""
+        state = self._load(url)
+        try:
+            body, etag, modified = fetch(url, state['etag'], state['modified'])
+        except URLError:
+            if state['digest'] is None:
+                raise
+            return state['entries']
+        if body is not None:
+            digest = hashlib.sha256(body).hexdigest()
+            if digest != state['digest']:
+                self.parses += 1
+                fresh = feedparser.parse(body).entries
+                state['entries'] = merge_entries(state['entries'], fresh)
+                state['digest'] = digest
+            state['etag'], state['modified'] = etag, modified
+            self._save(url, state)
+        return state['entries']
@@ -0,0 +1,128 @@
+import os
+import threading
+from urllib.error import URLError
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import feedcache
+from feedcache import FeedCache, merge_entries
+
+ITEM = """<item><title>{0}</title><link>https://pybit.es/{0}.html</link>
+<guid>{0}</guid><pubDate>Sun, 18 Feb 2018 20:52:00 +0100</pubDate>
+<category>Python</category></item>"""
+
+
+def make_feed(*titles):
+    items = ''.join(ITEM.format(title) for title in titles)
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel>'
+            f'<title>feed</title>{items}</channel></rss>').encode()
+
+
+def titles(entries):
+    return [entry.title for entry in entries]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeedCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def feed_file(tmp_path):
+    path = tmp_path / 'feed.xml'
+    path.write_bytes(make_feed('b', 'a'))
+    return path
+
+
+def test_local_feed_parsed_once(cache, feed_file):
+    assert titles(cache.entries(str(feed_file))) == ['b', 'a']
+    assert titles(cache.entries(str(feed_file))) == ['b', 'a']
+    assert cache.parses == 1
+
+
+def test_cache_survives_restart(cache, feed_file):
+    cache.entries(feed_file.as_uri())
+    restarted = FeedCache(cache.directory)
+    assert titles(restarted.entries(feed_file.as_uri())) == ['b', 'a']
+    assert restarted.parses == 0
+
+
+def test_touched_but_unchanged_not_reparsed(cache, feed_file):
+    cache.entries(str(feed_file))
+    stat = os.stat(feed_file)
+    os.utime(feed_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.entries(str(feed_file))
+    assert cache.parses == 1
+
+
+def test_new_entries_merged(cache, feed_file):
+    cache.entries(str(feed_file))
+    feed_file.write_bytes(make_feed('c', 'b'))
+    stat = os.stat(feed_file)
+    os.utime(feed_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert titles(cache.entries(str(feed_file))) == ['c', 'b', 'a']
+    assert cache.parses == 2
+
+
+def test_file_url_with_escapes(cache, tmp_path):
+    path = tmp_path / 'my feed.xml'
+    path.write_bytes(make_feed('a'))
+    assert '%20' in path.as_uri()
+    assert titles(cache.entries(path.as_uri())) == ['a']
+
+
+def test_merge_entries():
+    cached = [{'id': 'b', 'title': 'old b'}, {'id': 'a', 'title': 'a'}]
+    fresh = [{'id': 'c', 'title': 'c'}, {'id': 'b', 'title': 'new b'}]
+    assert merge_entries(cached, fresh) == fresh + [cached[1]]
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    body = make_feed('b', 'a')
+    etag = '"v1"'
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    server = HTTPServer(('127.0.0.1', 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/rss'
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_conditional_get(cache, feed_url):
+    FeedHandler.requests = []
+    assert titles(cache.entries(feed_url)) == ['b', 'a']
+    assert titles(cache.entries(feed_url)) == ['b', 'a']
+    assert FeedHandler.requests == [None, '"v1"']
+    assert cache.parses == 1
+
+
+def test_offline_falls_back_to_cache(cache, feed_url, monkeypatch):
+    cache.entries(feed_url)
+
+    def offline(*args, **kwargs):
+        raise URLError('no network')
+
+    monkeypatch.setattr(feedcache, 'urlopen', offline)
+    assert titles(cache.entries(feed_url)) == ['b', 'a']
+    with pytest.raises(URLError):
+        cache.entries(feed_url + '?other')
@@ -1,29 +1,86 @@
+from array import array
+from collections import deque
+from threading import Lock
 
+UNREACHED = -1
 
-class MulDivTree:
-    MAX_DEPTH = 40
-    minimum_map = {}
 
-    def __init__(self, parent=None, data=1, depth=0):
-        self.data = data
-        self.depth = depth
-        self.mul_2 = None
-        self.div_3 = None
-        self.parent = parent
+class MulDivSolver:
+    """Minimum number of *2 and //3 steps to get from 1 to a target.
 
-        if self.data not in MulDivTree.minimum_map.keys():
-            MulDivTree.minimum_map[self.data] = self.depth
-        else:
-            MulDivTree.minimum_map[self.data] = min(MulDivTree.minimum_map[self.data], self.depth)
+    A breadth-first search fills a flat array of step counts the first
+    time it is needed. After that warm-up every query is an O(1) lookup
+    (plus the path length for path). Shortest paths often climb far above
+    the target before dividing back down, so the search runs up to
+    search_limit, not just max_value: the counts are minimal over paths
+    whose values stay at or below it. The default of 1000 * max_value
+    agrees with a ten times larger bound for every target up to 10,000.
+    The table belongs to the instance and is built under a lock, so one
+    solver can be shared between threads.
+    """
 
-        if self.depth < self.MAX_DEPTH:
-            # ignore if a better match is already known
-            if not (self.data * 2 in MulDivTree.minimum_map.keys() and self.depth+1 >= MulDivTree.minimum_map[self.data * 2]):
-                self.mul_2 = MulDivTree(parent=self, data=self.data * 2, depth=self.depth+1)           
-            if not (self.data // 3 in MulDivTree.minimum_map.keys() and self.depth+1 >= MulDivTree.minimum_map[self.data // 3]):
-                self.div_3 = MulDivTree(parent=self, data=self.data // 3, depth=self.depth+1)
+    def __init__(self, max_value=10_000, search_limit=None):
+        if search_limit is None:
+            search_limit = 1000 * max_value
+        if search_limit < max_value:
+            raise ValueError('search_limit must be at least max_value')
+        self.max_value = max_value
+        self.search_limit = search_limit
+        self._steps = None
+        self._lock = Lock()
+
+    def _build(self):
+        with self._lock:
+            if self._steps is not None:
+                return
+            size = self.search_limit + 1
+            steps = array('h', [UNREACHED]) * size
+            steps[1] = 0
+            queue = deque([1])
+            while queue:
+                value = queue.popleft()
+                for child in (value * 2, value // 3):
+                    if child < size and steps[child] == UNREACHED:
+                        steps[child] = steps[value] + 1
+                        queue.append(child)
+            self._steps = steps
+
+    def steps(self, target):
+        """Minimum number of steps to reach target, None if unreachable."""
+        if self._steps is None:
+            self._build()
+        if not 0 <= target <= self.max_value:
+            raise ValueError(f'target must be between 0 and {self.max_value}')
+        steps = self._steps[target]
+        return None if steps == UNREACHED else steps
+
+    def _parent(self, value):
+        """A value one step closer to 1 on a shortest path to value."""
+        wanted = self._steps[value] - 1
+        candidates = [value * 3, value * 3 + 1, value * 3 + 2]
+        if value % 2 == 0:
+            candidates.insert(0, value // 2)
+        for candidate in candidates:
+            if (candidate <= self.search_limit
+                    and self._steps[candidate] == wanted):
+                return candidate
+
+    def path(self, target):
+        """The values visited from 1 to target, None if unreachable."""
+        if self.steps(target) is None:
+            return None
+        path = [target]
+        while path[-1] != 1:
+            path.append(self._parent(path[-1]))
+        path.reverse()
+        return path
+
+    def solve_many(self, targets):
+        """Map each target to its (steps, path)."""
+        return {target: (self.steps(target), self.path(target))
+                for target in targets}
 
 
 if __name__ == '__main__':
-    tree = MulDivTree()
-    print(tree.minimum_map[3012])
+    solver = MulDivSolver()
+    print(solver.steps(3012), solver.path(3012))
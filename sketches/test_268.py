@@ -0,0 +1,43 @@
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+import pytest
+
+spec = spec_from_file_location('muldiv', Path(__file__).with_name('268.py'))
+muldiv = module_from_spec(spec)
+spec.loader.exec_module(muldiv)
+MulDivSolver = muldiv.MulDivSolver
+
+
+def test_matches_a_much_larger_bound():
+    solver = MulDivSolver(max_value=300)
+    wider = MulDivSolver(max_value=300, search_limit=10 * solver.search_limit)
+    targets = range(301)
+    assert [solver.steps(t) for t in targets] == \
+        [wider.steps(t) for t in targets]
+
+
+def test_paths_climb_above_the_target():
+    solver = MulDivSolver(max_value=1385)
+    assert solver.steps(879) == 41
+    assert solver.steps(1385) == 39
+    assert max(solver.path(1385)) > 1385
+    # a tighter search bound misses the shortest path
+    assert MulDivSolver(1385, search_limit=100_000).steps(1385) == 52
+
+
+def test_path_is_valid():
+    solver = MulDivSolver(max_value=3012)
+    assert solver.steps(3012) == 22
+    for target in (0, 1, 2, 879, 3012):
+        path = solver.path(target)
+        assert path[0] == 1 and path[-1] == target
+        assert len(path) == solver.steps(target) + 1
+        assert all(b in (a * 2, a // 3) for a, b in zip(path, path[1:]))
+
+
+def test_bad_bounds():
+    with pytest.raises(ValueError):
+        MulDivSolver(max_value=10, search_limit=5)
+    with pytest.raises(ValueError):
+        MulDivSolver(max_value=10).steps(11)